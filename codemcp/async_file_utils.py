@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
+import codecs
 import os
-from typing import List, Literal
+from typing import Dict, List, Literal, Optional, Tuple
 
 import anyio
 
@@ -155,6 +156,34 @@ async def async_write_binary(
         await f.write(content)
 
 
+# Detection results are cached by (path, st_mtime_ns, st_size), so repeated
+# reads and edits of an unchanged file don't scan it again
+_DETECT_CACHE_SIZE = 256
+
+# Number of leading bytes async_detect_encoding inspects
+_ENCODING_SAMPLE_SIZE = 65536
+
+_StatKey = Tuple[str, int, int]
+
+_encoding_cache: Dict[_StatKey, str] = {}
+_line_endings_cache: Dict[_StatKey, str] = {}
+
+
+def _stat_key(file_path: str) -> Optional[_StatKey]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (file_path, st.st_mtime_ns, st.st_size)
+
+
+def _cache_put(cache: Dict[_StatKey, str], key: _StatKey, value: str) -> None:
+    if len(cache) >= _DETECT_CACHE_SIZE:
+        # Evict the oldest entry
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
 async def async_detect_encoding(file_path: str) -> str:
     """Asynchronously detect the encoding of a file.
 
@@ -164,16 +193,33 @@ async def async_detect_encoding(file_path: str) -> str:
     Returns:
         The detected encoding, defaulting to 'utf-8'
     """
-    if not os.path.exists(file_path):
+    key = _stat_key(file_path)
+    if key is None:
         return "utf-8"
+    cached = _encoding_cache.get(key)
+    if cached is not None:
+        return cached
 
     try:
-        # Try to read with utf-8 first
-        await async_open_text(file_path, encoding="utf-8")
+        async with await anyio.open_file(file_path, "rb") as f:
+            sample = await f.read(_ENCODING_SAMPLE_SIZE)
+    except FileNotFoundError:
+        # Removed since the stat above
         return "utf-8"
+
+    try:
+        # Try utf-8 first; the incremental decoder tolerates a multi-byte
+        # sequence cut off at the end of the sample, but not at end of file
+        codecs.getincrementaldecoder("utf-8")(errors="strict").decode(
+            sample, final=len(sample) < _ENCODING_SAMPLE_SIZE
+        )
+        encoding = "utf-8"
     except UnicodeDecodeError:
         # If utf-8 fails, default to a more permissive encoding
-        return "latin-1"
+        encoding = "latin-1"
+
+    _cache_put(_encoding_cache, key, encoding)
+    return encoding
 
 
 async def async_detect_line_endings(file_path: str) -> str:
@@ -185,4 +231,15 @@ async def async_detect_line_endings(file_path: str) -> str:
     Returns:
         'CRLF' or 'LF'
     """
-    return await detect_line_endings(file_path, return_format="format")
+    key = _stat_key(file_path)
+    if key is None:
+        # Missing files fall back to the configured preference, which is
+        # not tied to the file's contents
+        return await detect_line_endings(file_path, return_format="format")
+    cached = _line_endings_cache.get(key)
+    if cached is not None:
+        return cached
+
+    line_endings = await detect_line_endings(file_path, return_format="format")
+    _cache_put(_line_endings_cache, key, line_endings)
+    return line_endings
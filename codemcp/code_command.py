@@ -14,11 +14,29 @@ from .shell import run_command
 __all__ = [
     "get_command_from_config",
     "check_for_changes",
+    "clear_repo_caches",
     "run_code_command",
     "run_formatter_without_commit",
 ]
 
 
+# Parsed codemcp.toml files by path, with the (st_mtime_ns, st_size) they
+# were parsed at
+_config_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _load_config(config_path: str, st: os.stat_result) -> Dict[str, Any]:
+    """Parse codemcp.toml, reusing the previous parse if the file is unchanged."""
+    cached = _config_cache.get(config_path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    with open(config_path, "rb") as f:
+        config: Dict[str, Any] = tomli.load(f)
+    _config_cache[config_path] = (st.st_mtime_ns, st.st_size, config)
+    return config
+
+
 def get_command_from_config(project_dir: str, command_name: str) -> Optional[List[str]]:
     """Get a command from the codemcp.toml file.
 
@@ -33,20 +51,22 @@ def get_command_from_config(project_dir: str, command_name: str) -> Optional[Lis
         full_dir_path = normalize_file_path(project_dir)
         config_path = os.path.join(full_dir_path, "codemcp.toml")
 
-        if not os.path.exists(config_path):
+        try:
+            st = os.stat(config_path)
+        except FileNotFoundError:
             logging.warning(f"Config file not found: {config_path}")
             return None
 
-        with open(config_path, "rb") as f:
-            config: Dict[str, Any] = tomli.load(f)
+        config = _load_config(config_path, st)
 
         if "commands" in config and command_name in config["commands"]:
             cmd_config = config["commands"][command_name]
-            # Handle both direct command lists and dictionaries with 'command' field
+            # Handle both direct command lists and dictionaries with 'command' field.
+            # Return copies so callers can't modify the cached config.
             if isinstance(cmd_config, list):
-                return cast(List[str], cmd_config)
+                return list(cast(List[str], cmd_config))
             elif isinstance(cmd_config, dict) and "command" in cmd_config:
-                return cast(List[str], cmd_config["command"])
+                return list(cast(List[str], cmd_config["command"]))
 
         return None
     except Exception as e:
@@ -54,6 +74,35 @@ def get_command_from_config(project_dir: str, command_name: str) -> Optional[Lis
         return None
 
 
+# Repository root by project directory, for check_for_changes
+_repo_root_cache: Dict[str, str] = {}
+
+
+def clear_repo_caches() -> None:
+    """Forget cached repository roots, e.g. after a repository was moved."""
+    _repo_root_cache.clear()
+
+
+def _lookup_repository_root(project_dir: str) -> Optional[str]:
+    # A cached root is only reused while it still has a .git entry, which
+    # costs a stat rather than a git process
+    root = _repo_root_cache.get(project_dir)
+    if root is not None and os.path.lexists(os.path.join(root, ".git")):
+        return root
+    return None
+
+
+async def _get_cached_repository_root(project_dir: str) -> str:
+    """Get the repository root of project_dir, reusing earlier lookups."""
+    root = _lookup_repository_root(project_dir)
+    if root is not None:
+        return root
+
+    root = await get_repository_root(project_dir)
+    _repo_root_cache[project_dir] = root
+    return root
+
+
 async def check_for_changes(project_dir: str) -> bool:
     """Check if an operation made any changes to the code.
 
@@ -66,23 +115,53 @@ async def check_for_changes(project_dir: str) -> bool:
     try:
         # Get the git repository root for reliable status checking
         try:
-            git_cwd = await get_repository_root(project_dir)
+            git_cwd = await _get_cached_repository_root(project_dir)
         except (subprocess.SubprocessError, OSError, ValueError) as e:
             logging.error(f"Error getting git repository root: {e}")
             # Fall back to the project directory
             git_cwd = project_dir
 
-        # Check if working directory has uncommitted changes
-        status_result = await run_command(
-            ["git", "status", "--porcelain"],
+        # Check tracked files (staged or not) against HEAD; with --quiet, git
+        # stops at the first difference and reports it via the exit code
+        diff_result = await run_command(
+            ["git", "diff", "--quiet", "--no-ext-diff", "HEAD", "--"],
             cwd=git_cwd,
-            check=True,
+            check=False,
             capture_output=True,
             text=True,
+            discard_stdout=True,
         )
+        if diff_result.returncode == 1:
+            return True
+        if diff_result.returncode != 0:
+            # Most likely there is no HEAD yet; let git status decide
+            status_result = await run_command(
+                ["git", "status", "--porcelain"],
+                cwd=git_cwd,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
 
-        # If status output is not empty, there are changes
-        return bool(status_result.stdout.strip())
+            # If status output is not empty, there are changes
+            return bool(status_result.stdout.strip())
+
+        # Check for untracked files, listing untracked directories only once
+        untracked_result = await run_command(
+            [
+                "git",
+                "ls-files",
+                "--others",
+                "--exclude-standard",
+                "--directory",
+                "--no-empty-directory",
+            ],
+            cwd=git_cwd,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return bool(untracked_result.stdout.strip())
     except Exception as e:
         logging.error(f"Error checking for git changes: {e}")
         return False
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 
+import contextlib
 import logging
 import os
+import secrets
+import stat
 from typing import Optional, Tuple
 
 import anyio
@@ -163,7 +166,7 @@ async def write_text_content(
     content: str,
     encoding: str = "utf-8",
     line_endings: Optional[str] = None,
-) -> None:
+) -> float:
     """Write text content to a file with specified encoding and line endings.
     Automatically strips trailing whitespace from each line and ensures
     a trailing newline at the end of the file.
@@ -174,6 +177,9 @@ async def write_text_content(
         encoding: The encoding to use
         line_endings: The line endings to use ('CRLF', 'LF', '\r\n', or '\n').
                      If None, uses the system default.
+
+    Returns:
+        The modification time of the written file, as os.stat's st_mtime
     """
     # Import normalize_file_path for tilde expansion
     from .common import normalize_file_path
@@ -199,9 +205,34 @@ async def write_text_content(
     # Ensure directory exists
     ensure_directory_exists(file_path)
 
-    # Write the content using anyio
-    write_mode: OpenTextMode = "w"
-    async with await anyio.open_file(
-        file_path, write_mode, encoding=encoding, newline=""
-    ) as f:
-        await f.write(final_content)
+    # Write to a temporary file next to the target and rename it into place,
+    # so that a crash mid-write can't leave a truncated file behind.  Resolve
+    # symlinks first so that a link is updated through rather than replaced
+    target_path = os.path.realpath(file_path)
+    directory, name = os.path.split(target_path)
+    tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+    try:
+        existing_mode: Optional[int] = stat.S_IMODE(os.stat(target_path).st_mode)
+    except FileNotFoundError:
+        existing_mode = None
+
+    try:
+        async with await anyio.open_file(
+            tmp_path, "x", encoding=encoding, newline=""
+        ) as f:
+            fd = f.wrapped.fileno()
+            # Keep the permissions of the file being replaced
+            if existing_mode is not None:
+                os.fchmod(fd, existing_mode)
+            await f.write(final_content)
+            # Flush so the mtime reflects the last write, then take it from
+            # the open descriptor rather than stat'ing the path again
+            await f.flush()
+            mtime = os.fstat(fd).st_mtime
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+    return mtime
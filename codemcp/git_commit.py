@@ -11,8 +11,10 @@ from .git_query import (
     get_head_commit_chat_id,
     get_head_commit_hash,
     get_head_commit_message,
+    get_ref_commit_message,
     is_git_repository,
 )
+from .git_worker import read_commit
 from .shell import run_command
 
 __all__ = ["commit_changes", "create_commit_reference"]
@@ -20,6 +22,29 @@ __all__ = ["commit_changes", "create_commit_reference"]
 log = logging.getLogger(__name__)
 
 
+async def _get_commit_tree(git_cwd: str, rev: str) -> str:
+    """Get the tree hash of a commit, preferring the persistent cat-file worker.
+
+    Raises:
+        subprocess.CalledProcessError: If rev does not name a commit
+    """
+    try:
+        commit = await read_commit(git_cwd, rev)
+        if commit is not None and commit[0]:
+            return commit[0]
+    except (RuntimeError, OSError) as e:
+        log.debug("git cat-file worker unavailable, falling back: %s", e)
+
+    tree_result = await run_command(
+        ["git", "show", "-s", "--format=%T", rev],
+        cwd=git_cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return str(tree_result.stdout.strip())
+
+
 async def create_commit_reference(
     path: str,
     chat_id: str,
@@ -84,14 +109,7 @@ async def create_commit_reference(
 
     if rev_parse_result.returncode == 0:
         has_commits = True
-        tree_result = await run_command(
-            ["git", "show", "-s", "--format=%T", "HEAD"],
-            cwd=git_cwd,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        tree_hash = str(tree_result.stdout.strip())
+        tree_hash = await _get_commit_tree(git_cwd, "HEAD")
     else:
         # Create an empty tree if no HEAD exists
         empty_tree_result = await run_command(
@@ -309,24 +327,10 @@ async def commit_changes(
             head_hash = await get_head_commit_hash(git_cwd, short=False)
 
             # Get the tree from HEAD
-            tree_result = await run_command(
-                ["git", "show", "-s", "--format=%T", "HEAD"],
-                cwd=git_cwd,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            tree_hash = str(tree_result.stdout.strip())
+            tree_hash = await _get_commit_tree(git_cwd, "HEAD")
 
             # Get the commit message from the reference
-            ref_message_result = await run_command(
-                ["git", "log", "-1", "--pretty=%B", ref_name],
-                cwd=git_cwd,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            ref_message = str(ref_message_result.stdout.strip())
+            ref_message = await get_ref_commit_message(git_cwd, ref_name) or ""
 
             # Create a new commit with the same tree as HEAD but message from the reference
             # This effectively creates the commit without changing the working tree
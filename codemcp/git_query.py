@@ -5,6 +5,8 @@ import os
 import re
 import subprocess
 
+from . import shell
+from .git_worker import read_commit
 from .shell import run_command
 
 __all__ = [
@@ -14,6 +16,7 @@ __all__ = [
     "get_repository_root",
     "is_git_repository",
     "get_ref_commit_chat_id",
+    "get_ref_commit_message",
     "find_git_root",
     "get_current_commit_hash",
 ]
@@ -34,6 +37,14 @@ async def get_head_commit_message(directory: str) -> str:
         subprocess.SubprocessError: If HEAD does not exist or another git error occurs
         Exception: For any other errors during the operation
     """
+    # Fast path: read the commit object through the persistent cat-file worker
+    try:
+        commit = await read_commit(directory, "HEAD")
+        if commit is not None:
+            return commit[1].strip()
+    except (RuntimeError, OSError) as e:
+        log.debug("git cat-file worker unavailable, falling back: %s", e)
+
     # Get the commit message - this will fail if HEAD doesn't exist
     result = await run_command(
         ["git", "log", "-1", "--pretty=%B"],
@@ -154,6 +165,39 @@ async def get_repository_root(path: str) -> str:
     return str(result.stdout.strip())
 
 
+# Paths known to be inside a work tree, mapped to the .git entry found above
+# them; only trusted while that entry still exists
+_known_repositories: dict[str, str] = {}
+_KNOWN_REPOSITORIES_SIZE = 256
+
+
+def _find_dot_git(path: str) -> str | None:
+    """Return the nearest .git entry (directory or file) at or above path."""
+    directory = path
+    while True:
+        dot_git = os.path.join(directory, ".git")
+        if os.path.lexists(dot_git):
+            return dot_git
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _is_known_repository(abs_path: str) -> bool:
+    """Check whether git already confirmed abs_path is in a work tree.
+
+    This only takes a stat of the remembered .git entry.  Unknown paths
+    still have to be checked with git.
+    """
+    # None means the subprocess inherits our own environment
+    env = shell.get_subprocess_env() or os.environ
+    if "GIT_DIR" in env or "GIT_WORK_TREE" in env:
+        return False
+    known = _known_repositories.get(abs_path)
+    return known is not None and os.path.lexists(known)
+
+
 async def is_git_repository(path: str) -> bool:
     """Check if the path is within a Git repository.
 
@@ -163,18 +207,65 @@ async def is_git_repository(path: str) -> bool:
     Returns:
         True if path is in a Git repository, False otherwise
     """
+    abs_path = os.path.abspath(path)
+    if _is_known_repository(abs_path):
+        return True
+
     try:
         # Try to get the repository root - this handles path existence checks
         # and directory traversal internally
         await get_repository_root(path)
-
-        # If we get here, we found a valid git repository
-        return True
     except (subprocess.SubprocessError, OSError, ValueError):
         # If we can't get the repo root, it's not a proper git repository
         # or the path doesn't exist or isn't in a repo
         return False
 
+    # If we get here, we found a valid git repository
+    dot_git = _find_dot_git(abs_path)
+    if dot_git is not None:
+        if len(_known_repositories) >= _KNOWN_REPOSITORIES_SIZE:
+            # Evict the oldest entry
+            del _known_repositories[next(iter(_known_repositories))]
+        _known_repositories[abs_path] = dot_git
+    return True
+
+
+async def get_ref_commit_message(directory: str, ref_name: str) -> str | None:
+    """Read the commit message a fully qualified reference points to.
+
+    Returns:
+        The stripped commit message, or None if the reference doesn't exist
+    """
+    # Only fully qualified references are accepted, like `git show-ref --verify`
+    if ref_name.startswith("refs/"):
+        try:
+            commit = await read_commit(directory, ref_name)
+            return commit[1].strip() if commit is not None else None
+        except (RuntimeError, OSError) as e:
+            log.debug("git cat-file worker unavailable, falling back: %s", e)
+
+    # Check if the reference exists
+    result = await run_command(
+        ["git", "show-ref", "--verify", ref_name],
+        cwd=directory,
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        return None
+
+    # Get the commit message from the reference
+    message_result = await run_command(
+        ["git", "log", "-1", "--pretty=%B", ref_name],
+        cwd=directory,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return str(message_result.stdout.strip())
+
 
 async def get_ref_commit_chat_id(directory: str, ref_name: str) -> str | None:
     """Get the chat ID from a specific reference's commit message.
@@ -187,29 +278,11 @@ async def get_ref_commit_chat_id(directory: str, ref_name: str) -> str | None:
         The chat ID if found, None otherwise
     """
     try:
-        # Check if the reference exists
-        result = await run_command(
-            ["git", "show-ref", "--verify", ref_name],
-            cwd=directory,
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
+        commit_message = await get_ref_commit_message(directory, ref_name)
+        if commit_message is None:
             # Reference doesn't exist
             return None
 
-        # Get the commit message from the reference
-        message_result = await run_command(
-            ["git", "log", "-1", "--pretty=%B", ref_name],
-            cwd=directory,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        commit_message = str(message_result.stdout.strip())
-
         # Use regex to find the last occurrence of codemcp-id: XXX
         # The pattern looks for "codemcp-id: " followed by any characters up to a newline or end of string
         matches = re.findall(r"codemcp-id:\s*([^\n]*)", commit_message)
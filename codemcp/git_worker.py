@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+"""Persistent git helper processes for hot read-only queries.
+
+Spawning git costs a fork/exec plus git's own startup for every query.  For
+read-only lookups of objects (commit messages, trees) we instead keep a
+long-lived ``git cat-file --batch`` process per repository directory and feed
+it object names over stdin.  Responses are length-prefixed by cat-file itself
+(``<oid> <type> <size>\\n<content>\\n``), so we always read exactly as many
+bytes as were announced and never block on a partially filled pipe.
+
+Mutating operations must keep going through shell.run_command.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+from . import shell
+
+__all__ = [
+    "query",
+    "read_commit",
+    "close_workers",
+    "kill_workers",
+]
+
+log = logging.getLogger(__name__)
+
+# Upper bound on idle cat-file processes kept alive at once
+MAX_WORKERS = 8
+
+
+class GitWorker:
+    """A single long-running ``git cat-file`` process bound to a directory."""
+
+    def __init__(self, directory: str, mode: str) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.loop = asyncio.get_running_loop()
+        self.lock = asyncio.Lock()
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            "git",
+            "cat-file",
+            self.mode,
+            cwd=self.directory,
+            env=shell.get_subprocess_env(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+    async def query(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """Look up a single object.
+
+        Returns:
+            A tuple of (oid, type, content) or None if the object does not exist.
+            content is empty in --batch-check mode.
+
+        Raises:
+            RuntimeError: If the git process died or produced malformed output
+        """
+        async with self.lock:
+            process = self.process
+            if process is None or process.stdin is None or process.stdout is None:
+                raise RuntimeError("git cat-file worker is not running")
+
+            try:
+                process.stdin.write(spec.encode() + b"\n")
+                await process.stdin.drain()
+                header = await process.stdout.readline()
+            except (ConnectionError, OSError) as e:
+                raise RuntimeError(f"git cat-file worker failed: {e}") from e
+
+            if not header.endswith(b"\n"):
+                raise RuntimeError("git cat-file worker exited unexpectedly")
+
+            parts = header.decode().split()
+            if len(parts) == 2 and parts[1] in ("missing", "ambiguous"):
+                return None
+            if len(parts) != 3:
+                raise RuntimeError(f"Unexpected git cat-file output: {header!r}")
+
+            oid, obj_type, size = parts
+            content = b""
+            if self.mode == "--batch":
+                try:
+                    # Content is followed by a single LF terminator
+                    data = await process.stdout.readexactly(int(size) + 1)
+                except asyncio.IncompleteReadError as e:
+                    raise RuntimeError("git cat-file worker exited unexpectedly") from e
+                content = data[:-1]
+
+            return oid, obj_type, content
+
+    def kill(self) -> None:
+        if self.alive:
+            assert self.process is not None
+            try:
+                self.process.kill()
+            except (ProcessLookupError, RuntimeError):
+                pass
+
+    async def close(self) -> None:
+        process = self.process
+        if process is None:
+            return
+        if process.returncode is None and process.stdin is not None:
+            process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            self.kill()
+            await process.wait()
+
+
+_workers: Dict[Tuple[str, str], GitWorker] = {}
+
+
+async def _get_worker(directory: str, mode: str) -> GitWorker:
+    key = (directory, mode)
+    loop = asyncio.get_running_loop()
+
+    worker = _workers.pop(key, None)
+    if worker is not None and (worker.loop is not loop or not worker.alive):
+        # Subprocess transports are bound to the loop that created them
+        worker.kill()
+        worker = None
+
+    if worker is None:
+        while len(_workers) >= MAX_WORKERS:
+            oldest = next(iter(_workers))
+            _workers.pop(oldest).kill()
+        worker = GitWorker(directory, mode)
+        await worker.start()
+
+    # Keep the dict ordered from least to most recently used
+    _workers[key] = worker
+    return worker
+
+
+async def query(
+    directory: str, spec: str, mode: str = "--batch"
+) -> Optional[Tuple[str, str, bytes]]:
+    """Look up a git object through a persistent cat-file process.
+
+    Args:
+        directory: A directory inside the repository to query
+        spec: Any object name git understands (e.g. "HEAD", "refs/codemcp/x")
+        mode: Either "--batch" (header and content) or "--batch-check" (header only)
+
+    Returns:
+        A tuple of (oid, type, content), or None if the object does not exist
+
+    Raises:
+        ValueError: If spec or mode is invalid
+        RuntimeError: If the worker process failed; callers should fall back
+            to run_command
+        OSError: If git could not be started
+    """
+    if mode not in ("--batch", "--batch-check"):
+        raise ValueError(f"Unsupported git cat-file mode: {mode}")
+    if not spec or "\n" in spec:
+        raise ValueError(f"Invalid object name: {spec!r}")
+
+    worker = await _get_worker(directory, mode)
+    try:
+        return await worker.query(spec)
+    except RuntimeError:
+        _workers.pop((directory, mode), None)
+        worker.kill()
+        raise
+
+
+async def read_commit(directory: str, rev: str) -> Optional[Tuple[str, str]]:
+    """Read a commit's tree hash and raw message through the cat-file worker.
+
+    Args:
+        directory: A directory inside the repository to query
+        rev: The revision to read (e.g. "HEAD")
+
+    Returns:
+        A tuple of (tree_hash, message), or None if rev does not name a commit
+
+    Raises:
+        RuntimeError: If the worker process failed
+        OSError: If git could not be started
+    """
+    result = await query(directory, rev)
+    if result is None or result[1] != "commit":
+        return None
+
+    headers, _, body = result[2].partition(b"\n\n")
+    tree_hash = ""
+    encoding = "utf-8"
+    for line in headers.split(b"\n"):
+        if line.startswith(b"tree "):
+            tree_hash = line[5:].decode()
+        elif line.startswith(b"encoding "):
+            encoding = line[9:].decode()
+
+    try:
+        message = body.decode(encoding, errors="replace")
+    except LookupError:
+        message = body.decode("utf-8", errors="replace")
+    return tree_hash, message
+
+
+async def close_workers() -> None:
+    """Shut down all worker processes.
+
+    Workers created on the running event loop are closed gracefully; workers
+    left over from other (possibly closed) loops are killed.
+    """
+    loop = asyncio.get_running_loop()
+    workers = list(_workers.values())
+    _workers.clear()
+    for worker in workers:
+        if worker.loop is loop:
+            await worker.close()
+        else:
+            worker.kill()
+
+
+def kill_workers() -> None:
+    """Kill all worker processes without waiting for them to exit.
+
+    Unlike close_workers() this needs no running event loop, so it can be
+    called from signal handlers right before the process exits.
+    """
+    workers = list(_workers.values())
+    _workers.clear()
+    for worker in workers:
+        worker.kill()
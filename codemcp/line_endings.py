@@ -278,16 +278,6 @@ async def detect_line_endings(
     Returns:
         The detected line endings ('\n' or '\r\n') or ('LF' or 'CRLF') based on return_format
     """
-    if not os.path.exists(file_path):
-        line_ending = get_line_ending_preference(file_path)
-        return (
-            "LF"
-            if line_ending == "\n"
-            else "CRLF"
-            if return_format == "format"
-            else line_ending
-        )
-
     loop = asyncio.get_event_loop()
 
     def read_and_detect():
@@ -298,7 +288,8 @@ async def detect_line_endings(
                     return "CRLF" if return_format == "format" else "\r\n"
                 return "LF" if return_format == "format" else "\n"
         except Exception:
-            # If there's an error reading the file, use the line ending preference
+            # If the file doesn't exist or can't be read, use the line
+            # ending preference
             line_ending = get_line_ending_preference(file_path)
             return (
                 "LF"
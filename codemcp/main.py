@@ -6,6 +6,7 @@ import re
 from pathlib import Path
 from typing import List, Optional
 
+import anyio
 import click
 import pathspec
 import uvicorn
@@ -13,6 +14,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.applications import Starlette
 from starlette.routing import Mount
 
+from . import git_worker
 from .mcp import mcp
 from .tools.chmod import chmod
 from .tools.edit_file import edit_file
@@ -522,9 +524,43 @@ def create_sse_app(allowed_origins: Optional[List[str]] = None) -> Starlette:
     return app
 
 
+def install_uvloop() -> bool:
+    """Use uvloop as the asyncio event loop if it is installed.
+
+    uvloop's libuv-based pipe transports make subprocess spawning and pipe
+    reads noticeably cheaper, which matters because nearly every tool call
+    shells out to git via run_command.  uvloop is optional; versions older
+    than 0.15 are ignored because they can truncate large stdin writes.
+
+    Returns:
+        True if uvloop was installed as the event loop policy, False otherwise
+    """
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return False
+
+    try:
+        version = tuple(int(part) for part in uvloop.__version__.split(".")[:2])
+    except ValueError:
+        version = (0, 0)
+    if version < (0, 15):
+        logging.warning(
+            f"Ignoring uvloop {uvloop.__version__}: version 0.15 or newer is required"
+        )
+        return False
+
+    import asyncio
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logging.info(f"Using uvloop {uvloop.__version__} event loop")
+    return True
+
+
 def run() -> None:
     """Run the MCP server."""
     configure_logging()
+    install_uvloop()
 
     # Set up a signal handler to exit immediately on Ctrl+C
     import os
@@ -534,15 +570,24 @@ def run() -> None:
         logging.info(
             "Received shutdown signal - exiting immediately without waiting for connections"
         )
+        # os._exit skips any cleanup, so don't leave git cat-file workers behind
+        git_worker.kill_workers()
         os._exit(0)
 
     # Register for SIGINT (Ctrl+C) and SIGTERM
     signal.signal(signal.SIGINT, handle_exit)
     signal.signal(signal.SIGTERM, handle_exit)
 
+    async def run_stdio() -> None:
+        try:
+            await mcp.run_stdio_async()
+        finally:
+            # The client closed stdin; shut down workers while the loop is alive
+            await git_worker.close_workers()
+
     # The signal handler will force-exit the process when Ctrl+C is pressed
-    # so we don't need to worry about what happens inside mcp.run()
-    mcp.run()
+    # so we don't need to worry about what happens inside run_stdio()
+    anyio.run(run_stdio)
 
 
 @cli.command()
@@ -583,6 +628,7 @@ def serve(host: str, port: int, cors_origin: List[str]) -> None:
         logging.info(
             "Received shutdown signal - exiting immediately without waiting for connections"
         )
+        git_worker.kill_workers()
         os._exit(0)
 
     # Register for SIGINT (Ctrl+C) and SIGTERM
@@ -39,8 +39,7 @@ def load_rule_from_file(file_path: str) -> Optional[Rule]:
         A Rule object if the file is valid, None otherwise
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = Path(file_path).read_text(encoding="utf-8")
 
         # Parse the frontmatter and content
         frontmatter_match = re.match(r"^---\n(.*?)\n---\n(.*)", content, re.DOTALL)
@@ -2,12 +2,15 @@
 
 import asyncio
 import logging
+import os
 import subprocess
+import weakref
 from typing import Dict, List, Optional, Union
 
 __all__ = [
     "run_command",
     "get_subprocess_env",
+    "get_max_subprocesses",
 ]
 
 
@@ -22,6 +25,80 @@ def get_subprocess_env() -> Optional[Dict[str, str]]:
     return None
 
 
+# Seconds to keep collecting output after killing a process that timed out
+_DRAIN_TIMEOUT = 1.0
+
+# Semaphores can't be shared between event loops, so keep one per loop
+_subprocess_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+
+
+def get_max_subprocesses() -> int:
+    """
+    Get the maximum number of subprocesses run_command runs at once.
+
+    Can be set with the CODEMCP_MAX_SUBPROCESSES environment variable.  The
+    default is the CPU count, but at least 4 so that a long-running command
+    (e.g. a test suite) doesn't starve quick git queries on small machines.
+    """
+    default = max(4, os.cpu_count() or 1)
+    value = os.environ.get("CODEMCP_MAX_SUBPROCESSES")
+    if not value:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        logging.warning(
+            "Ignoring invalid CODEMCP_MAX_SUBPROCESSES=%r, using %d", value, default
+        )
+        return default
+    return limit
+
+
+def _get_subprocess_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _subprocess_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(get_max_subprocesses())
+        _subprocess_semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _read_stream(stream: asyncio.StreamReader, buf: bytearray) -> None:
+    """Append everything read from stream to buf until EOF."""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return
+        buf.extend(chunk)
+
+
+async def _feed_and_wait(
+    process: asyncio.subprocess.Process,
+    input_bytes: Optional[bytes],
+    readers: List["asyncio.Task[None]"],
+) -> None:
+    """Write input to the process, then wait for its output and exit."""
+    if process.stdin is not None:
+        if input_bytes:
+            process.stdin.write(input_bytes)
+            try:
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                # The process exited without reading all of its input
+                pass
+        process.stdin.close()
+
+    # asyncio.wait doesn't cancel the readers if we time out, so whatever
+    # they have collected so far stays available to the caller
+    if readers:
+        await asyncio.wait(readers)
+    await process.wait()
+
+
 async def run_command(
     cmd: List[str],
     cwd: Optional[str] = None,
@@ -31,6 +108,7 @@ async def run_command(
     wait_time: Optional[float] = None,  # Renamed from timeout to avoid ASYNC109
     shell: bool = False,
     input: Optional[str] = None,
+    discard_stdout: bool = False,
 ) -> subprocess.CompletedProcess[Union[str, bytes]]:
     """
     Run a subprocess command with consistent logging asynchronously.
@@ -44,23 +122,31 @@ async def run_command(
         wait_time: Timeout in seconds
         shell: If True, run command in a shell
         input: Input to pass to the subprocess's stdin
+        discard_stdout: If True, send stdout to /dev/null rather than a pipe;
+            stderr is still captured if capture_output is True
 
     Returns:
         CompletedProcess instance with attributes args, returncode, stdout, stderr
 
     Raises:
         RuntimeError: If check=True and process returns non-zero exit code
-        subprocess.TimeoutExpired: If the process times out
+        subprocess.TimeoutExpired: If the process times out; any output captured
+            before the timeout is attached as bytes in its stdout and stderr
 
     Notes:
         Environment variables are obtained from get_subprocess_env() function.
+        When the server runs under uvloop (see main.install_uvloop), process
+        spawning and pipe reads use uvloop's transports automatically.
     """
     # Log the command being run at INFO level
-    log_cmd = " ".join(str(c) for c in cmd)
+    log_cmd = " ".join(map(str, cmd))
     logging.info(f"Running command: {log_cmd}")
 
     # Prepare stdout and stderr pipes
-    stdout_pipe = asyncio.subprocess.PIPE if capture_output else None
+    if discard_stdout:
+        stdout_pipe: Optional[int] = asyncio.subprocess.DEVNULL
+    else:
+        stdout_pipe = asyncio.subprocess.PIPE if capture_output else None
     stderr_pipe = asyncio.subprocess.PIPE if capture_output else None
     stdin_pipe = asyncio.subprocess.PIPE if input is not None else None
 
@@ -69,28 +155,59 @@ async def run_command(
     if input is not None:
         input_bytes = input.encode()
 
-    # Run the subprocess asynchronously
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        cwd=cwd,
-        env=get_subprocess_env(),
-        stdout=stdout_pipe,
-        stderr=stderr_pipe,
-        stdin=stdin_pipe,
-    )
-
-    try:
-        # Wait for the process to complete with optional timeout
-        stdout_data, stderr_data = await asyncio.wait_for(
-            process.communicate(input=input_bytes), timeout=wait_time
-        )
-    except asyncio.TimeoutError:
-        process.kill()
-        await process.wait()
-        raise subprocess.TimeoutExpired(
-            cmd, float(wait_time) if wait_time is not None else 0.0
+    # Bound the number of concurrently running subprocesses
+    async with _get_subprocess_semaphore():
+        # Run the subprocess asynchronously
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            env=get_subprocess_env(),
+            stdout=stdout_pipe,
+            stderr=stderr_pipe,
+            stdin=stdin_pipe,
         )
 
+        # Read the pipes ourselves rather than via communicate(), so that output
+        # received before a timeout isn't thrown away along with the cancelled call
+        stdout_buf = bytearray()
+        stderr_buf = bytearray()
+        readers = [
+            asyncio.create_task(_read_stream(stream, buf))
+            for stream, buf in (
+                (process.stdout, stdout_buf),
+                (process.stderr, stderr_buf),
+            )
+            if stream is not None
+        ]
+
+        try:
+            # Wait for the process to complete with optional timeout
+            await asyncio.wait_for(
+                _feed_and_wait(process, input_bytes, readers), timeout=wait_time
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            # The pipes reach EOF once the child is gone, unless a grandchild
+            # still holds them open; don't wait on those forever
+            if readers:
+                _, pending = await asyncio.wait(readers, timeout=_DRAIN_TIMEOUT)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            await process.wait()
+            raise subprocess.TimeoutExpired(
+                cmd,
+                float(wait_time) if wait_time is not None else 0.0,
+                output=bytes(stdout_buf) if process.stdout is not None else None,
+                stderr=bytes(stderr_buf) if process.stderr is not None else None,
+            )
+
+    # Surface any error raised while reading the pipes
+    for task in readers:
+        task.result()
+    stdout_data = bytes(stdout_buf)
+    stderr_data = bytes(stderr_buf)
+
     # Handle text conversion
     stdout = ""
     stderr = ""
@@ -123,7 +240,7 @@ async def run_command(
 
     # Raise RuntimeError if check is True and command failed
     if check and result.returncode != 0:
-        error_message = f"Command failed with exit code {result.returncode}: {' '.join(str(c) for c in cmd)}"
+        error_message = f"Command failed with exit code {result.returncode}: {log_cmd}"
         if result.stdout:
             error_message += f"\nStdout: {result.stdout}"
         if result.stderr:
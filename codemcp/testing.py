@@ -2,45 +2,249 @@
 
 
 import asyncio
+import atexit
+import functools
 import os
 import re
+import shlex
+import shutil
+import signal
+import string
 import subprocess
 import sys
 import tempfile
+import threading
 import unittest
 from contextlib import asynccontextmanager
 from typing import (
     Any,
     AsyncGenerator,
+    Awaitable,
+    Callable,
     Dict,
     List,
     Optional,
     Protocol,
+    Sequence,
+    Tuple,
     TypeVar,
     Union,
     cast,
 )
 
-
-# Define a local ExceptionGroup class for type checking purposes
-# In Python 3.11+, this would be available as a built-in
-class ExceptionGroup(Exception):
-    """Simple ExceptionGroup implementation for type checking."""
-
-    def __init__(self, message: str, exceptions: List[Exception]) -> None:
-        self.exceptions: List[Exception] = exceptions
-        super().__init__(message, exceptions)
-
-
-from unittest import mock
-
+import anyio
 from expecttest import TestCase
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from codemcp import git_worker, shell
+from codemcp.mcp import mcp as codemcp_server
+from codemcp.tools.chmod import chmod
+from codemcp.tools.edit_file import edit_file
+from codemcp.tools.git_blame import git_blame
+from codemcp.tools.git_diff import git_diff
+from codemcp.tools.git_log import git_log
+from codemcp.tools.git_show import git_show
+from codemcp.tools.glob import glob
+from codemcp.tools.grep import grep
+from codemcp.tools.init_project import init_project
+from codemcp.tools.ls import ls
+from codemcp.tools.mv import mv
+from codemcp.tools.read_file import read_file
+from codemcp.tools.rm import rm
+from codemcp.tools.run_command import run_command
+from codemcp.tools.think import think
+from codemcp.tools.write_file import write_file
+
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None
+
 # Define types for objects used in the testing module
 T = TypeVar("T")
 
+# Parent directory for test repositories: $CODEMCP_TEST_TMPDIR if set,
+# otherwise /dev/shm (tmpfs) where available so git I/O stays in memory
+_TEST_TMPDIR: Optional[str] = os.environ.get("CODEMCP_TEST_TMPDIR") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+)
+
+# Exit status used by setup_repository's shell script when `git init` fails
+_GIT_INIT_FAILED = 97
+
+# Shell script that initializes, configures and commits the default test
+# repository in one process rather than spawning one git process per step
+_SETUP_SCRIPT = f"git init -b main || exit {_GIT_INIT_FAILED}\n" + " && ".join(
+    shlex.join(cmd)
+    for cmd in [
+        ["git", "config", "user.email", "test@example.com"],
+        ["git", "config", "user.name", "Test User"],
+        # Test repositories are throwaway; don't fsync anything (git >= 2.36)
+        ["git", "config", "core.fsync", "none"],
+        ["git", "add", "README.md", "codemcp.toml"],
+        ["git", "commit", "-m", "Initial commit"],
+    ]
+)
+
+# Prefix and alphabet of the chat ID reported by InitProject
+_CHAT_ID_PREFIX = "chat ID: "
+_CHAT_ID_CHARS = frozenset(string.ascii_letters + string.digits + "-")
+
+
+def _find_chat_id(text: str) -> Optional[str]:
+    """Return the chat ID following "chat ID: " in text, if any.
+
+    Equivalent to searching for r"chat ID: ([a-zA-Z0-9-]+)", without
+    going through the regex engine.
+    """
+    start = text.find(_CHAT_ID_PREFIX)
+    while start >= 0:
+        start += len(_CHAT_ID_PREFIX)
+        end = start
+        while end < len(text) and text[end] in _CHAT_ID_CHARS:
+            end += 1
+        if end > start:
+            return text[start:end]
+        start = text.find(_CHAT_ID_PREFIX, start)
+    return None
+
+
+# Subtool name -> tool function for in-process dispatch
+_TOOL_FNS: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "ReadFile": read_file,
+    "WriteFile": write_file,
+    "EditFile": edit_file,
+    "LS": ls,
+    "InitProject": init_project,
+    "RunCommand": run_command,
+    "Grep": grep,
+    "Glob": glob,
+    "RM": rm,
+    "MV": mv,
+    "Think": think,
+    "Chmod": chmod,
+    "GitLog": git_log,
+    "GitDiff": git_diff,
+    "GitShow": git_show,
+    "GitBlame": git_blame,
+}
+
+
+_HAVE_POSIX_SPAWN = hasattr(os, "posix_spawnp")
+
+
+def _spawn_git_and_wait(args: List[str], cwd: str, env: Dict[str, str]) -> int:
+    """Run git with inherited stdio via posix_spawn and wait for it to exit.
+
+    posix_spawn can't change directory, so git is told to with -C.  Like
+    subprocess, SIGPIPE and SIGXFSZ (ignored by Python) are reset to their
+    default handlers in the child.
+    """
+    pid = os.posix_spawnp(
+        "git",
+        ["git", "-C", cwd, *args],
+        env,
+        setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),
+    )
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+# Files committed in the default test repository.  codemcp.toml is required
+# in the repo root for permission checks.
+_SETUP_FILES: Dict[str, bytes] = {
+    "README.md": b"# Test Repository\n",
+    "codemcp.toml": b"",
+}
+
+
+def _write(path: str, content: bytes) -> None:
+    # Unbuffered: the files are tiny, so skip Python's text/buffer layers
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if content:
+            os.write(fd, content)
+    finally:
+        os.close(fd)
+
+
+def _write_setup_files(directory: str) -> None:
+    """Write the files committed in the default test repository."""
+    for name, content in _SETUP_FILES.items():
+        _write(os.path.join(directory, name), content)
+
+
+# Template repositories shared by every test in the process, keyed by
+# testing_time (which determines the commit hash); None marks a failed build
+_template_repositories: Dict[str, Optional[str]] = {}
+_template_repositories_lock = threading.Lock()
+
+
+def _build_template_repository(env: Dict[str, str]) -> Optional[str]:
+    template_dir = tempfile.mkdtemp(prefix="codemcp-template-", dir=_TEST_TMPDIR)
+    _write_setup_files(template_dir)
+    result = subprocess.run(
+        ["/bin/sh", "-c", _SETUP_SCRIPT],
+        cwd=template_dir,
+        env=env,
+        capture_output=True,
+    )
+    if result.returncode:
+        # Leave it to setup_repository to report the failure per test
+        shutil.rmtree(template_dir, ignore_errors=True)
+        return None
+    return template_dir
+
+
+def _get_template_repository(testing_time: str, env: Dict[str, str]) -> Optional[str]:
+    """Get the default test repository, building it on first use."""
+    with _template_repositories_lock:
+        if testing_time not in _template_repositories:
+            _template_repositories[testing_time] = _build_template_repository(env)
+        return _template_repositories[testing_time]
+
+
+@atexit.register
+def _remove_template_repositories() -> None:
+    for template_dir in _template_repositories.values():
+        if template_dir is not None:
+            shutil.rmtree(template_dir, ignore_errors=True)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard link src to dst, falling back to a copy (e.g. across filesystems)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _copy_repository(src: str, dst: str) -> None:
+    """Copy a template repository into dst.
+
+    Git never modifies object files in place, so .git/objects is hard
+    linked; everything else (index, refs, working tree) is copied because
+    tests mutate those.
+    """
+    git_dir = os.path.join(src, ".git")
+
+    def ignore_objects(directory: str, names: List[str]) -> List[str]:
+        return ["objects"] if directory == git_dir else []
+
+    shutil.copytree(src, dst, dirs_exist_ok=True, ignore=ignore_objects)
+    shutil.copytree(
+        os.path.join(src, ".git", "objects"),
+        os.path.join(dst, ".git", "objects"),
+        copy_function=_link_or_copy,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _to_snake(name: str) -> str:
+    """Convert a subtool name to lowercase snake case (e.g., ReadFile -> read_file)."""
+    return "".join(["_" + c.lower() if c.isupper() else c for c in name]).lstrip("_")
+
 
 class TextContent(Protocol):
     """Protocol for objects with a text attribute."""
@@ -56,48 +260,145 @@ class CallToolResult(Protocol):
 
 
 class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
-    """Base class for end-to-end tests of codemcp using MCP client."""
+    """Base class for end-to-end tests of codemcp using MCP client.
+
+    Every test gets its own temporary repository and environment, so tests
+    are independent and are run in parallel with pytest-xdist (``-n auto``
+    is part of the project's pytest addopts).  Commit timestamps are fixed
+    via testing_time and must stay identical across workers, because tests
+    assert exact commit hashes.
+    """
 
     in_process: bool = True
 
+    # With in_process=False, run the server as a real `python -m codemcp`
+    # subprocess over stdio rather than in-process over memory streams, so
+    # that its startup and inherited environment are exercised too.  Setting
+    # MCPTEST_STDIO=1 does the same for every out-of-process class.
+    use_stdio: bool = False
+
+    # Run tests on uvloop when it is installed; set to False to opt out
+    use_uvloop: bool = True
+
+    # Fixed timestamp for git
+    testing_time: str = "1112911993"
+
+    # Cached result of _build_base_env, per class
+    _BASE_ENV: Optional[Dict[str, str]] = None
+
+    # Event loop policy to restore after the class when uvloop was installed
+    _saved_loop_policy: Optional[asyncio.AbstractEventLoopPolicy] = None
+
+    @classmethod
+    def setUpClass(cls):
+        """Install uvloop's event loop policy for the class if requested."""
+        super().setUpClass()
+
+        # IsolatedAsyncioTestCase creates each test's loop from the current
+        # policy, so installing uvloop's policy here covers the whole class
+        cls._saved_loop_policy = None
+        if cls.use_uvloop and uvloop is not None:
+            cls._saved_loop_policy = asyncio.get_event_loop_policy()
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())  # type: ignore
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the event loop policy."""
+        if cls._saved_loop_policy is not None:
+            asyncio.set_event_loop_policy(cls._saved_loop_policy)
+            cls._saved_loop_policy = None
+        super().tearDownClass()
+
+    @classmethod
+    def _build_base_env(cls) -> Dict[str, str]:
+        """Build the environment variables used for git in tests.
+
+        Like os.environ.setdefault, anything already set in the environment
+        wins over these defaults.
+        """
+        return {
+            # Reproducible git behavior
+            "GIT_TERMINAL_PROMPT": "0",
+            "EDITOR": ":",
+            "GIT_MERGE_AUTOEDIT": "no",
+            "LANG": "C",
+            "LC_ALL": "C",
+            "PAGER": "cat",
+            "TZ": "UTC",
+            "TERM": "dumb",
+            # For deterministic commits
+            "GIT_AUTHOR_EMAIL": "author@example.com",
+            "GIT_AUTHOR_NAME": "A U Thor",
+            "GIT_COMMITTER_EMAIL": "committer@example.com",
+            "GIT_COMMITTER_NAME": "C O Mitter",
+            "GIT_COMMITTER_DATE": f"{cls.testing_time} -0700",
+            "GIT_AUTHOR_DATE": f"{cls.testing_time} -0700",
+            **os.environ,
+        }
+
     async def asyncSetUp(self):
         """Async setup method to prepare the test environment."""
         # Create a temporary directory for testing
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.testing_time = "1112911993"  # Fixed timestamp for git
-
-        # Initialize environment variables for git
-        self.env = os.environ.copy()
-        # Set environment variables for reproducible git behavior
-        self.env.setdefault("GIT_TERMINAL_PROMPT", "0")
-        self.env.setdefault("EDITOR", ":")
-        self.env.setdefault("GIT_MERGE_AUTOEDIT", "no")
-        self.env.setdefault("LANG", "C")
-        self.env.setdefault("LC_ALL", "C")
-        self.env.setdefault("PAGER", "cat")
-        self.env.setdefault("TZ", "UTC")
-        self.env.setdefault("TERM", "dumb")
-        # For deterministic commit times
-        self.env.setdefault("GIT_AUTHOR_EMAIL", "author@example.com")
-        self.env.setdefault("GIT_AUTHOR_NAME", "A U Thor")
-        self.env.setdefault("GIT_COMMITTER_EMAIL", "committer@example.com")
-        self.env.setdefault("GIT_COMMITTER_NAME", "C O Mitter")
-        self.env.setdefault("GIT_COMMITTER_DATE", f"{self.testing_time} -0700")
-        self.env.setdefault("GIT_AUTHOR_DATE", f"{self.testing_time} -0700")
-
-        # Patch get_subprocess_env to use the test environment
-        self.env_patcher = mock.patch(
-            "codemcp.shell.get_subprocess_env", return_value=self.env
+        self.temp_dir = tempfile.TemporaryDirectory(dir=_TEST_TMPDIR)
+        # The env only depends on the class (via testing_time), so build it
+        # once per class and hand each test its own copy
+        cls = type(self)
+        base_env = cls.__dict__.get("_BASE_ENV")
+        if base_env is None:
+            base_env = cls._BASE_ENV = cls._build_base_env()
+        self.env = dict(base_env)
+        self._chat_id: Optional[str] = None
+
+        # Default subprocess arguments for git_run, without and with output
+        # capture; callers' kwargs are merged over these, never into them
+        self._git_kwargs: Dict[str, Any] = {
+            "cwd": self.temp_dir.name,
+            "env": self.env,
+        }
+        self._git_capture_kwargs: Dict[str, Any] = {
+            **self._git_kwargs,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.PIPE,
+        }
+
+        # Tools may report the temp dir as given or canonicalized (e.g.
+        # /var -> /private/var on macOS); match both in a single pass,
+        # longest first
+        real_temp_dir = os.path.realpath(self.temp_dir.name)  # noqa: ASYNC240
+        temp_dir_paths = {self.temp_dir.name, real_temp_dir}
+        # Every spelling of the temp dir ends in its unique mkdtemp basename,
+        # which makes for a cheap check before running the regex
+        self._temp_dir_basename = os.path.basename(self.temp_dir.name)
+        self._temp_dir_re = re.compile(
+            "|".join(map(re.escape, sorted(temp_dir_paths, key=len, reverse=True)))
         )
-        self.env_patcher.start()
 
-        # Initialize a git repository in the temp directory
-        await self.setup_repository()
+        # Point get_subprocess_env at the test environment; a plain attribute
+        # swap avoids building a mock for every test
+        env = self.env
+        self._orig_get_subprocess_env = shell.get_subprocess_env
+        shell.get_subprocess_env = lambda: env
+
+        # Initialize a git repository in the temp directory.  Unless a subclass
+        # customizes setup_repository, copy the process-wide template instead
+        # of running git for every test.
+        template_dir = None
+        if type(self).setup_repository is MCPEndToEndTestCase.setup_repository:
+            template_dir = await asyncio.to_thread(
+                _get_template_repository, self.testing_time, self.env
+            )
+        if template_dir is not None:
+            _copy_repository(template_dir, self.temp_dir.name)
+        else:
+            await self.setup_repository()
 
     async def asyncTearDown(self):
         """Async teardown to clean up after the test."""
-        # Stop the environment patcher
-        self.env_patcher.stop()
+        # Shut down git cat-file workers bound to this test's event loop
+        await git_worker.close_workers()
+
+        # Restore get_subprocess_env
+        shell.get_subprocess_env = self._orig_get_subprocess_env
         self.temp_dir.cleanup()
 
     async def setup_repository(self):
@@ -106,45 +407,55 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
         This method can be overridden by subclasses to customize the repository setup.
         By default, it initializes a git repository and creates an initial commit.
         """
-        # Initialize and configure git
-        try:
-            await self.git_run(["init", "-b", "main"])
-        except subprocess.CalledProcessError:
+        # Write the files off the event loop
+        await asyncio.to_thread(_write_setup_files, self.temp_dir.name)
+
+        # Initialize, configure and commit in a single shell rather than
+        # spawning one git process per step
+        proc = await asyncio.create_subprocess_exec(
+            "/bin/sh",
+            "-c",
+            _SETUP_SCRIPT,
+            cwd=self.temp_dir.name,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode == _GIT_INIT_FAILED:
             self.fail(
                 "git version is too old for tests! Please install a newer version of git."
             )
-        await self.git_run(["config", "user.email", "test@example.com"])
-        await self.git_run(["config", "user.name", "Test User"])
-
-        # Create initial commit
-        readme_path = os.path.join(self.temp_dir.name, "README.md")
-        with open(readme_path, "w") as f:  # noqa: ASYNC230
-            f.write("# Test Repository\n")
-
-        # Create a codemcp.toml file in the repo root (required for permission checks)
-        codemcp_toml_path = os.path.join(self.temp_dir.name, "codemcp.toml")
-        with open(codemcp_toml_path, "w") as f:  # noqa: ASYNC230
-            f.write("")
+        if proc.returncode:
+            raise subprocess.CalledProcessError(
+                proc.returncode, _SETUP_SCRIPT, output=stdout, stderr=stderr
+            )
 
-        await self.git_run(["add", "README.md", "codemcp.toml"])
-        await self.git_run(["commit", "-m", "Initial commit"])
+    def _normalize_str(self, text: str) -> str:
+        """Replace the actual temp dir path in text with a fixed placeholder."""
+        if self._temp_dir_basename not in text:
+            return text
+        return self._temp_dir_re.sub("/tmp/test_dir", text)
 
     def normalize_path(self, text: Any) -> Union[str, List[object], Any]:
         """Normalize temporary directory paths in output text."""
-        if self.temp_dir and self.temp_dir.name:
-            # Handle CallToolResult objects by converting to string first
-            if hasattr(text, "content"):
-                # This is a CallToolResult object, extract the content
-                text = cast(CallToolResult, text).content
-
-            # Handle lists where items might have a 'text' attribute
-            if isinstance(text, list):
-                # Return lists as-is - we only normalize string content
-                return text  # type: ignore
-
-            # Replace the actual temp dir path with a fixed placeholder
-            if isinstance(text, str):
-                return text.replace(self.temp_dir.name, "/tmp/test_dir")
+        # Replace the actual temp dir path with a fixed placeholder
+        if isinstance(text, str):
+            return self._normalize_str(text)
+
+        # Handle lists where items might have a 'text' attribute
+        if isinstance(text, list):
+            # Return lists as-is - we only normalize string content
+            return text  # type: ignore
+
+        # Handle CallToolResult objects by converting to string first
+        if hasattr(text, "content"):
+            # This is a CallToolResult object, extract the content
+            content = cast(CallToolResult, text).content
+            if isinstance(content, str):
+                return self._normalize_str(content)
+            return content
+
         # Return anything else as-is
         return text
 
@@ -197,9 +508,9 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
         Raises:
             AssertionError: If chat_id cannot be found in text
         """
-        chat_id_match = re.search(r"chat ID: ([a-zA-Z0-9-]+)", text)
-        assert chat_id_match is not None, "Could not find chat ID in text"
-        return chat_id_match.group(1)
+        chat_id = _find_chat_id(text)
+        assert chat_id is not None, "Could not find chat ID in text"
+        return chat_id
 
     async def _dispatch_to_subtool(self, subtool: str, kwargs: Dict[str, Any]) -> Any:
         """Dispatch to the appropriate subtool function based on the subtool name.
@@ -217,91 +528,12 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
         Raises:
             ValueError: If the subtool is unknown
         """
-        # Directly call the appropriate tool function
-        if subtool == "ReadFile":
-            from codemcp.tools.read_file import read_file
-
-            return await read_file(**kwargs)
-
-        elif subtool == "WriteFile":
-            from codemcp.tools.write_file import write_file
-
-            return await write_file(**kwargs)
-
-        elif subtool == "EditFile":
-            from codemcp.tools.edit_file import edit_file
-
-            return await edit_file(**kwargs)
-
-        elif subtool == "LS":
-            from codemcp.tools.ls import ls
-
-            return await ls(**kwargs)
-
-        elif subtool == "InitProject":
-            from codemcp.tools.init_project import init_project
-
-            # No need for parameter conversion anymore - init_project accepts both path and directory
-            return await init_project(**kwargs)
-
-        elif subtool == "RunCommand":
-            from codemcp.tools.run_command import run_command
-
-            # No need for parameter conversion anymore - run_command accepts both path and project_dir
-            return await run_command(**kwargs)
-
-        elif subtool == "Grep":
-            from codemcp.tools.grep import grep
-
-            return await grep(**kwargs)
-
-        elif subtool == "Glob":
-            from codemcp.tools.glob import glob
-
-            return await glob(**kwargs)
-
-        elif subtool == "RM":
-            from codemcp.tools.rm import rm
-
-            return await rm(**kwargs)
-
-        elif subtool == "MV":
-            from codemcp.tools.mv import mv
-
-            return await mv(**kwargs)
-
-        elif subtool == "Think":
-            from codemcp.tools.think import think
-
-            return await think(**kwargs)
-
-        elif subtool == "Chmod":
-            from codemcp.tools.chmod import chmod
-
-            return await chmod(**kwargs)
-
-        elif subtool == "GitLog":
-            from codemcp.tools.git_log import git_log
-
-            return await git_log(**kwargs)
-
-        elif subtool == "GitDiff":
-            from codemcp.tools.git_diff import git_diff
-
-            return await git_diff(**kwargs)
-
-        elif subtool == "GitShow":
-            from codemcp.tools.git_show import git_show
-
-            return await git_show(**kwargs)
-
-        elif subtool == "GitBlame":
-            from codemcp.tools.git_blame import git_blame
-
-            return await git_blame(**kwargs)
+        try:
+            tool_fn = _TOOL_FNS[subtool]
+        except KeyError:
+            raise ValueError(f"Unknown subtool: {subtool}") from None
 
-        else:
-            raise ValueError(f"Unknown subtool: {subtool}")
+        return await tool_fn(**kwargs)
 
     async def call_tool_assert_error(
         self,
@@ -348,10 +580,8 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
                 assert session is not None, (
                     "Session cannot be None when in_process=False"
                 )
-                # Convert subtool name to lowercase snake case (e.g., ReadFile -> read_file)
-                subtool_snake_case = ''.join(['_' + c.lower() if c.isupper() else c for c in subtool]).lstrip('_')
                 # Call the subtool directly instead of calling the codemcp tool
-                result = await session.call_tool(subtool_snake_case, kwargs)  # type: ignore
+                result = await session.call_tool(_to_snake(subtool), kwargs)  # type: ignore
                 self.assertTrue(result.isError, result)
                 error_message = self.extract_text_from_result(result.content)
                 return cast(str, self.normalize_path(error_message))
@@ -399,28 +629,68 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
             # Use the dispatcher to call the appropriate function
             result = await self._dispatch_to_subtool(subtool, kwargs)
 
+            # Most tools return plain strings, which need no extraction
+            if isinstance(result, str):
+                return self._normalize_str(result)
+
             # Return the normalized, extracted text result
             normalized_result = self.normalize_path(result)
             return self.extract_text_from_result(normalized_result)
         else:
             assert session is not None, "Session cannot be None when in_process=False"
-            # Convert subtool name to lowercase snake case (e.g., ReadFile -> read_file)
-            subtool_snake_case = ''.join(['_' + c.lower() if c.isupper() else c for c in subtool]).lstrip('_')
             # Call the subtool directly instead of calling the codemcp tool
-            result = await session.call_tool(subtool_snake_case, kwargs)  # type: ignore
+            result = await session.call_tool(_to_snake(subtool), kwargs)  # type: ignore
             self.assertFalse(result.isError, result)
             normalized_result = self.normalize_path(result.content)
             return self.extract_text_from_result(normalized_result)
 
+    async def call_tools_concurrent(
+        self,
+        session: Optional[ClientSession],
+        specs: Sequence[Tuple[str, Dict[str, Any]]],
+        max_concurrency: int = 8,
+    ) -> List[str]:
+        """Call several independent tools concurrently and assert they succeed.
+
+        Only use this for calls that don't depend on each other's effects;
+        tools that commit to git must still be called one at a time.
+
+        Args:
+            session: The client session to use (None when in_process=True)
+            specs: A list of (tool_name, tool_params) pairs, as accepted by
+                call_tool_assert_success
+            max_concurrency: Maximum number of tool calls in flight at once
+
+        Returns:
+            List[str]: The extracted text of each result, in the order of specs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call_one(tool_name: str, tool_params: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self.call_tool_assert_success(
+                    session, tool_name, tool_params
+                )
+
+        return list(
+            await asyncio.gather(*(call_one(name, params) for name, params in specs))
+        )
+
     async def get_chat_id(self, session: Optional[ClientSession]) -> str:
         """Initialize project and get chat_id.
 
+        The project is initialized once per test; later calls return the
+        same chat_id.
+
         Args:
             session: The client session to use (kept for backward compatibility but unused)
 
         Returns:
             str: The chat_id
         """
+        if self._chat_id is not None:
+            return self._chat_id
+
         # Use the _dispatch_to_subtool for consistency with other test methods
         init_result_text = await self._dispatch_to_subtool(
             "InitProject",
@@ -433,13 +703,11 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
         )
 
         # Extract chat_id from the init result
-        chat_id_match = re.search(r"chat ID: ([a-zA-Z0-9-]+)", str(init_result_text))
-        assert chat_id_match is not None, (
-            "Could not find chat ID in initialization result"
-        )
-        chat_id = chat_id_match.group(1)
+        chat_id = _find_chat_id(str(init_result_text))
+        assert chat_id is not None, "Could not find chat ID in initialization result"
+        self._chat_id = chat_id
 
-        return chat_id
+        return self._chat_id
 
     @asynccontextmanager
     async def _unwrap_exception_groups(self) -> AsyncGenerator[None, None]:
@@ -448,31 +716,36 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
         """
         try:
             yield
-        except ExceptionGroup as eg:
-            # Since we're using our own ExceptionGroup implementation,
-            # we know exceptions is a List[Exception]
-            if len(eg.exceptions) == 1:
-                exc: Exception = eg.exceptions[0]
-                # Recursively unwrap if it's another ExceptionGroup with a single exception
-                while isinstance(exc, ExceptionGroup):
-                    if len(exc.exceptions) == 1:
-                        exc = exc.exceptions[0]
-                    else:
-                        break
-                raise exc from None
-            else:
+        except* Exception as eg:
+            # Non-group exceptions arrive here wrapped in a single-exception
+            # group, so they come out of the unwrapping unchanged
+            exc: Exception = eg
+            while isinstance(exc, ExceptionGroup) and len(exc.exceptions) == 1:
+                exc = exc.exceptions[0]
+            if exc is eg:
                 # Multiple exceptions - don't unwrap
                 raise
+            raise exc from None
 
     @asynccontextmanager
     async def create_client_session(
         self,
     ) -> AsyncGenerator[Optional[ClientSession], None]:
-        """Create an MCP client session connected to codemcp server."""
+        """Create an MCP client session connected to codemcp server.
+
+        The server runs in-process over memory streams, unless use_stdio is
+        set (or MCPTEST_STDIO=1), in which case it runs as a
+        `python -m codemcp` subprocess over stdio.
+        """
         if self.in_process:
             yield None
             return
 
+        if not (self.use_stdio or os.environ.get("MCPTEST_STDIO")):
+            async with self.create_in_process_session() as session:
+                yield session
+            return
+
         # Set up server parameters for the codemcp MCP server
         server_params = StdioServerParameters(
             command=sys.executable,  # Current Python executable
@@ -481,13 +754,99 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
             # Working directory is specified directly with kwargs in stdio_client
         )
 
+        # A single unwrapping layer is enough: it unwraps nested
+        # single-exception groups from both task groups in one go
+        async with (
+            self._unwrap_exception_groups(),
+            stdio_client(server_params) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            # Initialize the connection
+            await session.initialize()
+            yield session
+
+    @asynccontextmanager
+    async def create_in_process_session(self) -> AsyncGenerator[ClientSession, None]:
+        """Create an MCP client session connected to an in-process codemcp server.
+
+        The server runs as a task on the test's event loop and exchanges
+        messages with the client over anyio memory streams, so no interpreter
+        has to be started.  Subprocesses spawned by tools still get self.env
+        through the patched shell.get_subprocess_env.
+        """
+        # FastMCP has no public accessor for its low-level server in the mcp
+        # versions we support; the SDK's own in-memory test helper reads the
+        # same attribute.  Classes with use_stdio cover the real server.
+        server = codemcp_server._mcp_server  # type: ignore
+        client_send, server_receive = anyio.create_memory_object_stream(1)
+        server_send, client_receive = anyio.create_memory_object_stream(1)
+
         async with self._unwrap_exception_groups():
-            async with stdio_client(server_params) as (read, write):
-                async with self._unwrap_exception_groups():
-                    async with ClientSession(read, write) as session:
-                        # Initialize the connection
+            async with (
+                client_send,
+                server_receive,
+                server_send,
+                client_receive,
+                anyio.create_task_group() as tg,
+            ):
+                tg.start_soon(
+                    server.run,
+                    server_receive,
+                    server_send,
+                    server.create_initialization_options(),
+                )
+                try:
+                    async with ClientSession(client_receive, client_send) as session:
                         await session.initialize()
                         yield session
+                finally:
+                    tg.cancel_scope.cancel()
+
+    async def git_cat(self, spec: str) -> bytes:
+        """Read a git object in the test repository without spawning git.
+
+        Uses a persistent `git cat-file --batch` process (see codemcp.git_worker)
+        that is shut down in asyncTearDown.
+
+        Args:
+            spec: Any object name git understands (e.g. "HEAD", "HEAD:README.md")
+
+        Returns:
+            bytes: The raw object content
+
+        Raises:
+            subprocess.CalledProcessError: If the object does not exist
+        """
+        result = await git_worker.query(self.temp_dir.name, spec)
+        if result is None:
+            raise subprocess.CalledProcessError(
+                128,
+                ["git", "cat-file", "--batch"],
+                stderr=f"{spec} missing".encode(),
+            )
+        return result[2]
+
+    async def _git_query_fast(self, args: List[str]) -> Optional[str]:
+        """Answer `log -1 --pretty=%B [rev]` and `rev-parse <rev>` via git_cat.
+
+        Returns None if args aren't one of these queries or the revision
+        can't be resolved, in which case git_run falls back to spawning git
+        (so errors are reported exactly as git reports them).
+        """
+        if args[:3] == ["log", "-1", "--pretty=%B"] and len(args) <= 4:
+            rev = args[3] if len(args) == 4 else "HEAD"
+            if rev.startswith("-"):
+                return None
+            commit = await git_worker.read_commit(self.temp_dir.name, rev)
+            return commit[1].strip() if commit is not None else None
+
+        if len(args) == 2 and args[0] == "rev-parse" and not args[1].startswith("-"):
+            result = await git_worker.query(
+                self.temp_dir.name, args[1], mode="--batch-check"
+            )
+            return result[0] if result is not None else None
+
+        return None
 
     async def git_run(
         self,
@@ -522,43 +881,58 @@ class MCPEndToEndTestCase(TestCase, unittest.IsolatedAsyncioTestCase):
             # Get commit log as string
             log_output = await self.git_run(["log", "--oneline"], capture_output=True, text=True)
         """
+        # Answer common read-only queries from the persistent cat-file worker
+        if capture_output and text and not kwargs:
+            output = await self._git_query_fast(args)
+            if output is not None:
+                return output
+
         # Always include 'git' as the command
         cmd = ["git"] + args
 
-        # Set defaults for working directory and environment
-        kwargs.setdefault("cwd", self.temp_dir.name)
-        kwargs.setdefault("env", self.env)
-
-        # Capture output if requested
-        if capture_output:
-            kwargs.setdefault("stdout", subprocess.PIPE)
-            kwargs.setdefault("stderr", subprocess.PIPE)
-
-        # Run the command asynchronously
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            **kwargs,
-        )
-
-        stdout, stderr = await proc.communicate()
+        # Default to the temp dir and test env, capturing output if requested
+        template = self._git_capture_kwargs if capture_output else self._git_kwargs
+        kwargs = {**template, **kwargs} if kwargs else template
+
+        stdout: Optional[bytes] = None
+        stderr: Optional[bytes] = None
+        if _HAVE_POSIX_SPAWN and not capture_output and kwargs.keys() <= {"cwd", "env"}:
+            # Fire-and-wait: spawn directly in a worker thread, bypassing the
+            # asyncio subprocess transport
+            returncode = await asyncio.to_thread(
+                _spawn_git_and_wait, args, kwargs["cwd"], kwargs["env"]
+            )
+        else:
+            # Run the command asynchronously
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                **kwargs,
+            )
 
-        # Build a CompletedProcess-like result
-        result = subprocess.CompletedProcess[bytes](
-            args=cmd,
-            returncode=proc.returncode or 0,  # Use 0 if returncode is None
-            stdout=stdout,
-            stderr=stderr,
-        )
+            if proc.stdin is None and proc.stdout is None and proc.stderr is None:
+                # Nothing to feed or collect (output goes to the parent's stdout
+                # and stderr), so skip communicate()'s pipe reader machinery
+                await proc.wait()
+            else:
+                stdout, stderr = await proc.communicate()
+            returncode = proc.returncode or 0  # Use 0 if returncode is None
 
         # Check for error if requested
-        if check and proc.returncode and proc.returncode != 0:
+        if check and returncode != 0:
             cmd_str = " ".join(cmd)
             raise subprocess.CalledProcessError(
-                proc.returncode, cmd_str, output=stdout, stderr=stderr
+                returncode, cmd_str, output=stdout, stderr=stderr
             )
 
         # Return the appropriate result type
         if capture_output and text:
             # Always decode to string when text=True even if stdout is empty
             return stdout.decode().strip() if stdout else ""
-        return result
+
+        # Only build a CompletedProcess-like result when it is returned
+        return subprocess.CompletedProcess[bytes](
+            args=cmd,
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+        )
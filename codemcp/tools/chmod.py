@@ -2,12 +2,11 @@
 
 import os
 import stat
-from typing import Any
+from typing import Any, Callable
 
 from ..common import normalize_file_path
 from ..git import commit_changes
 from ..mcp import mcp
-from ..shell import run_command
 from .commit_utils import append_commit_hash
 
 __all__ = [
@@ -28,6 +27,25 @@ Example:
   chmod a-x path/to/file  # Makes a file non-executable for all users
 """
 
+# mode -> (executable bits set afterwards, and pre-bound formatters for the
+# "already" message, the commit description and the result message)
+_MODE_TABLE: dict[
+    str, tuple[bool, Callable[..., str], Callable[..., str], Callable[..., str]]
+] = {
+    "a+x": (
+        True,
+        "File '{path}' is already executable".format,
+        "Make '{name}' executable".format,
+        "Made file '{path}' executable and committed changes".format,
+    ),
+    "a-x": (
+        False,
+        "File '{path}' is already non-executable".format,
+        "Remove executable permission from '{name}'".format,
+        "Removed executable permission from file '{path}' and committed changes".format,
+    ),
+}
+
 
 @mcp.tool()
 async def chmod(
@@ -62,53 +80,38 @@ async def chmod(
     # Normalize the file path
     absolute_path = normalize_file_path(path)
 
-    # Check if file exists
-    if not os.path.exists(absolute_path):
-        raise FileNotFoundError(f"The file does not exist: {path}")
+    # Stat the file once; this doubles as the existence check
+    try:
+        current_mode = os.stat(absolute_path).st_mode
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file does not exist: {path}") from None
 
     # Verify that the mode is supported
-    if mode not in ["a+x", "a-x"]:
+    try:
+        executable, fmt_already, fmt_description, fmt_result = _MODE_TABLE[mode]
+    except KeyError:
         raise ValueError(
             f"Unsupported chmod mode: {mode}. Only 'a+x' and 'a-x' are supported."
-        )
+        ) from None
 
     # Get the directory containing the file for git operations
     directory = os.path.dirname(absolute_path)
 
     # Check current file permissions
-    current_mode = os.stat(absolute_path).st_mode
-    is_executable = bool(current_mode & stat.S_IXUSR)
-
-    if mode == "a+x" and is_executable:
-        message = f"File '{path}' is already executable"
-        # Append commit hash
-        message, _ = await append_commit_hash(message, directory, commit_hash)
-        return message
-    elif mode == "a-x" and not is_executable:
-        message = f"File '{path}' is already non-executable"
+    if bool(current_mode & stat.S_IXUSR) == executable:
+        message = fmt_already(path=path)
         # Append commit hash
-        message, _ = await append_commit_hash(message, directory, commit_hash)
+        message, _ = await append_commit_hash(
+            message, directory, commit_hash, already_normalized=True
+        )
         return message
 
-    # Execute chmod command
-    cmd = ["chmod", mode, absolute_path]
-    await run_command(
-        cmd=cmd,
-        cwd=directory,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+    # Flip the executable bits in-process rather than spawning chmod(1)
+    new_mode = current_mode | 0o111 if executable else current_mode & ~0o111
+    os.chmod(absolute_path, stat.S_IMODE(new_mode))
 
     # Prepare success message
-    if mode == "a+x":
-        description = f"Make '{os.path.basename(absolute_path)}' executable"
-        action_msg = f"Made file '{path}' executable"
-    else:
-        description = (
-            f"Remove executable permission from '{os.path.basename(absolute_path)}'"
-        )
-        action_msg = f"Removed executable permission from file '{path}'"
+    description = fmt_description(name=os.path.basename(absolute_path))
 
     # Commit the changes
     success, commit_message = await commit_changes(
@@ -121,14 +124,14 @@ async def chmod(
         raise RuntimeError(f"Failed to commit chmod changes: {commit_message}")
 
     # Prepare result string
-    result_string = f"{action_msg} and committed changes"
+    result_string = fmt_result(path=path)
 
     # Format the result for assistant
     formatted_result = render_result_for_assistant({"output": result_string})
 
     # Append commit hash
     formatted_result, _ = await append_commit_hash(
-        formatted_result, directory, commit_hash
+        formatted_result, directory, commit_hash, already_normalized=True
     )
 
     return formatted_result
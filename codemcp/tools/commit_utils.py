@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
 import logging
-from typing import Tuple
+import os
+from typing import Dict, Optional, Tuple
 
 from ..common import normalize_file_path
 from ..git_query import get_current_commit_hash
@@ -10,9 +11,69 @@ __all__ = [
     "append_commit_hash",
 ]
 
+# Current commit hashes by path, with the signature of the repository's HEAD
+# they were read at
+_HASH_CACHE_SIZE = 256
+_hash_cache: Dict[str, Tuple[Tuple[object, ...], str]] = {}
+
+
+def _read_small(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _head_signature(path: str) -> Optional[Tuple[object, ...]]:
+    """Summarize everything `git rev-parse --short HEAD` depends on in path's repo.
+
+    HEAD and the loose ref it points to are small, so their contents are
+    used directly.  packed-refs is summarized by its stat; git replaces it by
+    renaming a lock file over it.  The pack directory covers the
+    abbreviation length, which grows with the number of packed objects.
+
+    Returns:
+        A tuple of stat signatures, or None if no plain .git directory was
+        found (e.g. a worktree, whose .git is a file), in which case the
+        hash must not be cached
+    """
+    directory = path if os.path.isdir(path) else os.path.dirname(path)
+    while not os.path.isdir(os.path.join(directory, ".git")):
+        if os.path.lexists(os.path.join(directory, ".git")):
+            return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+    git_dir = os.path.join(directory, ".git")
+    head = _read_small(os.path.join(git_dir, "HEAD"))
+    if head is None:
+        return None
+
+    signature: list[object] = [head]
+    if head.startswith(b"ref: "):
+        ref = head[5:].strip().decode("utf-8", errors="replace")
+        signature.append(_read_small(os.path.join(git_dir, ref)))
+    signature.append(_stat_signature(os.path.join(git_dir, "packed-refs")))
+    signature.append(_stat_signature(os.path.join(git_dir, "objects", "pack")))
+    return tuple(signature)
+
 
 async def append_commit_hash(
-    result: str, path: str | None, commit_hash: str | None = None
+    result: str,
+    path: str | None,
+    commit_hash: str | None = None,
+    already_normalized: bool = False,
 ) -> Tuple[str, str | None]:
     """Get the current Git commit hash and append it to the result string.
 
@@ -20,6 +81,8 @@ async def append_commit_hash(
         result: The original result string to append to
         path: Path to the Git repository (if available)
         commit_hash: Optional Git commit hash to use instead of fetching the current one
+        already_normalized: Whether path was already passed through
+            normalize_file_path by the caller
 
     Returns:
         A tuple containing:
@@ -34,11 +97,23 @@ async def append_commit_hash(
         return result, None
 
     # Normalize the path
-    normalized_path = normalize_file_path(path)
+    normalized_path = path if already_normalized else normalize_file_path(path)
+
+    # Reuse the hash from an earlier call while HEAD hasn't moved
+    signature = _head_signature(normalized_path)
+    cached = _hash_cache.get(normalized_path)
+    if signature is not None and cached is not None and cached[0] == signature:
+        current_hash = cached[1]
+        return f"{result}\n\nCurrent commit hash: {current_hash}", current_hash
 
     try:
         current_hash = await get_current_commit_hash(normalized_path)
         if current_hash:
+            if signature is not None:
+                if len(_hash_cache) >= _HASH_CACHE_SIZE:
+                    # Evict the oldest entry
+                    del _hash_cache[next(iter(_hash_cache))]
+                _hash_cache[normalized_path] = (signature, current_hash)
             return f"{result}\n\nCurrent commit hash: {current_hash}", current_hash
     except Exception as e:
         logging.warning(f"Failed to get current commit hash: {e}", exc_info=True)
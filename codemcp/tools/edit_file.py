@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import difflib
-import hashlib
+import itertools
 import logging
 import math
 import os
@@ -9,16 +9,16 @@ import re
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Tuple
 
+from ..async_file_utils import async_open_binary
 from ..code_command import run_formatter_without_commit
 from ..common import get_edit_snippet, normalize_file_path
 from ..file_utils import (
-    async_open_text,
     check_file_path_and_permissions,
     check_git_tracking_for_existing_file,
     write_text_content,
 )
 from ..git import commit_changes
-from ..line_endings import detect_line_endings
+from ..line_endings import normalize_to_lf
 from ..mcp import mcp
 from .commit_utils import append_commit_hash
 
@@ -31,6 +31,13 @@ __all__ = [
     "apply_edit_pure",
 ]
 
+# Matches lines that consist only of spaces and tabs
+_BLANK_WS_RE = re.compile(r"(?m)^[ \t]+$")
+
+# Matches trailing whitespace that str.rstrip() would remove from a line, or a
+# line boundary other than "\n" that str.splitlines() would split on
+_STRIPPABLE_RE = re.compile(r"[^\S\n](?:\n|\Z)|[\r\v\f\x1c-\x1e\x85\u2028\u2029]")
+
 
 def find_similar_file(file_path: str) -> str | None:
     """Find a similar file with a different extension.
@@ -53,10 +60,12 @@ def find_similar_file(file_path: str) -> str | None:
     if not os.path.exists(directory):
         return None
 
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    for f in os.listdir(directory):
-        if f.startswith(base_name + ".") and f != os.path.basename(file_path):
-            return os.path.join(directory, f)
+    file_name = os.path.basename(file_path)
+    prefix = os.path.splitext(file_name)[0] + "."
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(prefix) and entry.name != file_name:
+                return os.path.join(directory, entry.name)
     return None
 
 
@@ -64,6 +73,7 @@ def apply_edit_pure(
     content: str,
     old_string: str,
     new_string: str,
+    build_patch: bool = True,
 ) -> Tuple[List[Dict[str, Any]], str, Optional[str]]:
     """Apply an edit to content using robust matching strategies.
 
@@ -71,6 +81,8 @@ def apply_edit_pure(
         content: The original content
         old_string: The text to replace
         new_string: The text to replace it with
+        build_patch: If False, skip building the patch and return an empty list
+            in its place
 
     Returns:
         A tuple of (patch, updated_content, error_message)
@@ -80,6 +92,9 @@ def apply_edit_pure(
     # For creating a new file, just return the new content
     if not old_string.strip():
         updated_file = new_string
+        if not build_patch:
+            return [], updated_file, None
+
         old_lines: List[str] = []
         new_lines = new_string.split("\n")
 
@@ -97,10 +112,12 @@ def apply_edit_pure(
         return result_patch, updated_file, None
 
     # First try direct replacement (most common case and efficient)
-    if old_string in content:
+    first = content.find(old_string)
+    if first != -1:
         # Check for uniqueness of old_string before applying the replacement
-        # We need to check this to avoid ambiguity in matches
-        if content.count(old_string) > 1:
+        # We need to check this to avoid ambiguity in matches.  Looking for a
+        # second occurrence after the first stops early, unlike count()
+        if content.find(old_string, first + len(old_string)) != -1:
             # First try to use the dotdotdots approach which handles multiple matches by context
             try:
                 test_result = try_dotdotdots(content, old_string, new_string)
@@ -115,20 +132,13 @@ def apply_edit_pure(
                     # Create a useful diff/patch structure for dotdotdots result
                     dotdot_patch: List[Dict[str, Any]] = []
                     if (
-                        content != updated_file
+                        build_patch and content != updated_file
                     ):  # Only create a patch if there were actual changes
                         old_lines = old_string.split("\n")
                         new_lines = new_string.split("\n")
 
-                        # Try to find the line number where the change occurs
-                        try:
-                            # This is a simplification; for exact matches this works,
-                            # but for fuzzy matches we would need a more sophisticated approach
-                            before_text = content.split(old_string)[0]
-                            line_num = before_text.count("\n")
-                        except Exception:
-                            # Fallback: just say it's at the start of the file
-                            line_num = 0
+                        # Find the line number where the change occurs
+                        line_num = content.count("\n", 0, first)
 
                         dotdot_patch.append(
                             {
@@ -160,23 +170,17 @@ def apply_edit_pure(
                 )
 
         # If we get here, there's only one occurrence of old_string in content
-        updated_file = content.replace(old_string, new_string, 1)
+        updated_file = content[:first] + new_string + content[first + len(old_string) :]
 
         # Create a useful diff/patch structure
         diff_patch: List[Dict[str, Any]] = []
-        if content != updated_file:  # Only create a patch if there were actual changes
+        # Only create a patch if requested and there were actual changes
+        if build_patch and content != updated_file:
             old_lines = old_string.split("\n")
             new_lines = new_string.split("\n")
 
-            # Try to find the line number where the change occurs
-            try:
-                # This is a simplification; for exact matches this works,
-                # but for fuzzy matches we would need a more sophisticated approach
-                before_text = content.split(old_string)[0]
-                line_num = before_text.count("\n")
-            except Exception:
-                # Fallback: just say it's at the start of the file
-                line_num = 0
+            # Find the line number where the change occurs
+            line_num = content.count("\n", 0, first)
 
             diff_patch.append(
                 {
@@ -192,27 +196,33 @@ def apply_edit_pure(
         return diff_patch, updated_file, None
 
     # Try with trailing whitespace stripped from each line
-    content_lines = content.splitlines()
     old_lines = old_string.splitlines()
+    old_lines_stripped = [line.rstrip() for line in old_lines]
+    old_text_stripped = "\n".join(old_lines_stripped)
+
+    # If content has nothing for rstrip() to remove and only "\n" line breaks,
+    # stripping it would at most drop its final newline, so a stripped match
+    # must also be a plain substring; fail early without the per-line pass
+    if not _STRIPPABLE_RE.search(content) and old_text_stripped not in content:
+        logger.debug("All matching techniques failed. No changes made.")
+        return [], content, "String to replace not found in file."
 
     # Check if we can find a match ignoring trailing whitespace
+    content_lines = content.splitlines()
     content_lines_stripped = [line.rstrip() for line in content_lines]
-    old_lines_stripped = [line.rstrip() for line in old_lines]
-
-    old_text_stripped = "\n".join(old_lines_stripped)
     content_stripped = "\n".join(content_lines_stripped)
 
-    if old_text_stripped in content_stripped:
-        # Find the position in the stripped content
-        start_pos = content_stripped.find(old_text_stripped)
-
+    # Find the position in the stripped content
+    start_pos = content_stripped.find(old_text_stripped)
+    if start_pos != -1:
         # Count newlines to find the line number
-        line_num = content_stripped[:start_pos].count("\n")
+        line_num = content_stripped.count("\n", 0, start_pos)
 
         # Replace those lines with the new content
+        new_lines = new_string.splitlines()
         result_lines = (
             content_lines[:line_num]
-            + new_string.splitlines()
+            + new_lines
             + content_lines[line_num + len(old_lines) :]
         )
         updated_file = "\n".join(result_lines)
@@ -223,16 +233,17 @@ def apply_edit_pure(
 
         # Create a useful diff/patch structure
         whitespace_patch: List[Dict[str, Any]] = []
-        if content != updated_file:  # Only create a patch if there were actual changes
+        # Only create a patch if requested and there were actual changes
+        if build_patch and content != updated_file:
             # Try to find the line number where the change occurs
             whitespace_patch.append(
                 {
                     "oldStart": line_num + 1,
                     "oldLines": len(old_lines),
                     "newStart": line_num + 1,
-                    "newLines": len(new_string.splitlines()),
+                    "newLines": len(new_lines),
                     "lines": [f"-{line}" for line in old_lines]
-                    + [f"+{line}" for line in new_string.splitlines()],
+                    + [f"+{line}" for line in new_lines],
                 },
             )
 
@@ -242,37 +253,6 @@ def apply_edit_pure(
         return [], content, "String to replace not found in file."
 
 
-async def apply_edit(
-    file_path: str,
-    old_string: str,
-    new_string: str,
-) -> Tuple[List[Dict[str, Any]], str, Optional[str]]:
-    """Apply an edit to a file using robust matching strategies.
-
-    Args:
-        file_path: The path to the file
-        old_string: The text to replace
-        new_string: The text to replace it with
-
-    Returns:
-        A tuple of (patch, updated_file, error_message)
-        error_message is None if the edit was successful, otherwise it contains an error message
-
-    """
-    # Import normalize_file_path for tilde expansion
-    from ..common import normalize_file_path
-
-    # Normalize the path with tilde expansion
-    file_path = normalize_file_path(file_path)
-
-    if os.path.exists(file_path):
-        content = await async_open_text(file_path, encoding="utf-8")
-    else:
-        content = ""
-
-    return apply_edit_pure(content, old_string, new_string)
-
-
 def prep(content: str) -> tuple[str, list[str]]:
     """Prepare content for comparison by ensuring it ends with a newline
     and splitting into lines with preserved line endings.
@@ -339,16 +319,19 @@ def perfect_replace(
         Updated content if a perfect match was found, None otherwise
 
     """
-    part_tup = tuple(part_lines)
     part_len = len(part_lines)
 
+    # Strip every line once up front.  An exact match is also a match with
+    # trailing whitespace stripped, so only the stripped lines are compared,
+    # and only where the first line already matches
+    part_stripped = [line.rstrip() for line in part_lines]
+    whole_stripped = [line.rstrip() for line in whole_lines]
+    first = part_stripped[0] if part_stripped else None
+
     for i in range(len(whole_lines) - part_len + 1):
-        whole_tup = tuple(whole_lines[i : i + part_len])
-        whole_tup_stripped = tuple(
-            line.rstrip() for line in whole_lines[i : i + part_len]
-        )
-        part_tup_stripped = tuple(line.rstrip() for line in part_lines)
-        if part_tup == whole_tup or part_tup_stripped == whole_tup_stripped:
+        if first is not None and whole_stripped[i] != first:
+            continue
+        if whole_stripped[i : i + part_len] == part_stripped:
             res = whole_lines[:i] + replace_lines + whole_lines[i + part_len :]
             return "".join(res)
 
@@ -522,17 +505,45 @@ def replace_closest_edit_distance(
     min_len = math.floor(len(part_lines) * (1 - scale))
     max_len = math.ceil(len(part_lines) * (1 + scale))
 
+    # part is the matcher's second sequence, so its index is only built once
+    matcher = SequenceMatcher(None, b=part)
+
+    # Join the file once and slice each window out of it by line offsets,
+    # rather than joining the overlapping windows over and over
+    whole = "".join(whole_lines)
+    offsets = [0, *itertools.accumulate(map(len, whole_lines))]
+
     for length in range(min_len, max_len):
         for i in range(len(whole_lines) - length + 1):
-            chunk = whole_lines[i : i + length]
-            chunk = "".join(chunk)
+            chunk = whole[offsets[i] : offsets[i + length]]
+
+            # Only an identical chunk has a ratio of 1.0, so nothing can beat it
+            if chunk == part:
+                max_similarity = 1.0
+                most_similar_chunk_start = i
+                most_similar_chunk_end = i + length
+                break
+
+            # real_quick_ratio() and quick_ratio() are cheap upper bounds on
+            # ratio(); skip chunks that can't beat the best one so far or
+            # reach the threshold
+            matcher.set_seq1(chunk)
+            bound = matcher.real_quick_ratio()
+            if bound <= max_similarity or bound < similarity_thresh:
+                continue
+            bound = matcher.quick_ratio()
+            if bound <= max_similarity or bound < similarity_thresh:
+                continue
 
-            similarity = SequenceMatcher(None, chunk, part).ratio()
+            similarity = matcher.ratio()
 
             if similarity > max_similarity:
                 max_similarity = similarity
                 most_similar_chunk_start = i
                 most_similar_chunk_end = i + length
+        else:
+            continue
+        break
 
     if max_similarity < similarity_thresh:
         return None
@@ -574,9 +585,26 @@ def find_similar_lines(
     best_match: list[str] = []  # Initialize with empty list to avoid None checks
     best_match_i = 0  # Initialize to avoid unbound variable errors
 
+    matcher = SequenceMatcher(None, search_lines_list)
+
     for i in range(len(content_lines_list) - len(search_lines_list) + 1):
         chunk = content_lines_list[i : i + len(search_lines_list)]
-        ratio = SequenceMatcher(None, search_lines_list, chunk).ratio()
+
+        # Only an identical chunk has a ratio of 1.0, so nothing can beat it
+        if chunk == search_lines_list:
+            best_ratio = 1.0
+            best_match = chunk
+            best_match_i = i
+            break
+
+        # quick_ratio() is a cheap upper bound on ratio(); skip chunks that
+        # can't beat the best one so far or reach the threshold
+        matcher.set_seq2(chunk)
+        bound = matcher.quick_ratio()
+        if bound <= best_ratio or bound < threshold:
+            continue
+
+        ratio = matcher.ratio()
         if ratio > best_ratio:
             best_ratio = ratio
             best_match = chunk
@@ -680,25 +708,24 @@ def debug_string_comparison(
         True if strings are different, False if they are the same
 
     """
+    # Skip the diagnostics (repr, encoding, diffing) unless they'd be logged
+    if not logger.isEnabledFor(logging.DEBUG):
+        return s1 != s2
+
     # Basic checks
     length_same = len(s1) == len(s2)
     content_same = s1 == s2
 
     logger.debug("String comparison debug:")
-    logger.debug(f"  Length same? {length_same} ({len(s1)} vs {len(s2)})")
-    logger.debug(f"  Content same? {content_same}")
-
-    # Hash check
-    hash1 = hashlib.md5(s1.encode("utf-8")).hexdigest()
-    hash2 = hashlib.md5(s2.encode("utf-8")).hexdigest()
-    logger.debug(f"  MD5 hashes: {hash1} vs {hash2}")
+    logger.debug("  Length same? %s (%d vs %d)", length_same, len(s1), len(s2))
+    logger.debug("  Content same? %s", content_same)
 
     # If strings appear to be the same but should be different
     if content_same:
         # Check for invisible characters or encoding issues
         s1_repr = repr(s1)
         s2_repr = repr(s2)
-        logger.debug(f"  Repr comparison: {s1_repr[:100]} vs {s2_repr[:100]}")
+        logger.debug("  Repr comparison: %s vs %s", s1_repr[:100], s2_repr[:100])
 
         # Check byte by byte
         bytes1 = s1.encode("utf-8")
@@ -712,17 +739,25 @@ def debug_string_comparison(
             for i, (b1, b2) in enumerate(zip(bytes1, bytes2, strict=False)):
                 if b1 != b2:
                     logger.debug(
-                        f"  First byte difference at position {i}: {b1} vs {b2}",
+                        "  First byte difference at position %d: %d vs %d",
+                        i,
+                        b1,
+                        b2,
                     )
                     break
     else:
-        # Find differences
-        diff = list(difflib.ndiff(s1.splitlines(), s2.splitlines()))
-        changes = [d for d in diff if d.startswith("+ ") or d.startswith("- ")]
+        # Find differences; skip the two file header lines, and stop once the
+        # first five changed lines have been found
+        diff = difflib.unified_diff(s1.splitlines(), s2.splitlines(), n=0, lineterm="")
+        changes = list(
+            itertools.islice(
+                (d for d in itertools.islice(diff, 2, None) if d[:2] != "@@"), 5
+            )
+        )
         if changes:
             logger.debug("  Line differences (first 5):")
-            for d in changes[:5]:
-                logger.debug(f"    {d}")
+            for d in changes:
+                logger.debug("    %s", d)
 
         # Check if strings are equal after stripping trailing whitespace
         s1_no_trailing = "\n".join([line.rstrip() for line in s1.splitlines()])
@@ -733,12 +768,8 @@ def debug_string_comparison(
             )
 
         # Check if strings are equal after normalizing only whitespace-only lines
-        s1_normalized = "\n".join(
-            [line.rstrip() if line.strip() == "" else line for line in s1.splitlines()],
-        )
-        s2_normalized = "\n".join(
-            [line.rstrip() if line.strip() == "" else line for line in s2.splitlines()],
-        )
+        s1_normalized = _BLANK_WS_RE.sub("", s1)
+        s2_normalized = _BLANK_WS_RE.sub("", s2)
         if s1_normalized == s2_normalized:
             logger.debug("  Strings match when normalizing only whitespace-only lines!")
 
@@ -840,8 +871,14 @@ async def edit_file(
     if not is_valid:
         raise ValueError(error_message)
 
+    # Stat the file once; this establishes both its existence and its mtime
+    try:
+        file_stat: Optional[os.stat_result] = os.stat(full_file_path)
+    except OSError:
+        file_stat = None
+
     # Handle creating a new file - skip commit_pending_changes for non-existent files
-    creating_new_file = old_string == "" and not os.path.exists(full_file_path)
+    creating_new_file = old_string == "" and file_stat is None
 
     if not creating_new_file:
         # Only check commit_pending_changes for existing files
@@ -866,11 +903,11 @@ async def edit_file(
     # Proceed with the edit now that we've confirmed the strings are different
 
     # Handle creating a new file
-    if old_string == "" and os.path.exists(full_file_path):
+    if old_string == "" and file_stat is not None:
         raise FileExistsError("Cannot create new file - file already exists.")
 
     # Handle creating a new file
-    if old_string == "" and not os.path.exists(full_file_path):
+    if creating_new_file:
         directory = os.path.dirname(full_file_path)
         os.makedirs(directory, exist_ok=True)
         await write_text_content(full_file_path, new_string)
@@ -892,7 +929,7 @@ async def edit_file(
         return result
 
     # Check if file exists
-    if not os.path.exists(full_file_path):
+    if file_stat is None:
         # Try to find a similar file
         similar_file = find_similar_file(full_file_path)
         message = f"File does not exist: {full_file_path}"
@@ -913,21 +950,24 @@ async def edit_file(
         )
 
     # Check if file has been modified since read
-    if read_file_timestamps and os.path.exists(full_file_path):
-        last_write_time = os.stat(full_file_path).st_mtime
+    if read_file_timestamps:
+        last_write_time = file_stat.st_mtime
         if last_write_time > read_file_timestamps.get(full_file_path, 0):
             raise ValueError(
                 "File has been modified since read, either by the user or by a linter. Read it again before attempting to write it."
             )
 
-    # Use UTF-8 encoding and detect line endings
-    line_endings = await detect_line_endings(full_file_path, return_format="format")
-
-    # Read the original file
-    content = await async_open_text(full_file_path, encoding="utf-8")
+    # Read the original file once; line endings are detected from the raw
+    # bytes (looking at the same 4 KiB sample as detect_line_endings) before
+    # normalizing them the way a text-mode read would
+    raw = await async_open_binary(full_file_path)
+    line_endings = "CRLF" if raw.find(b"\r\n", 0, 4096) != -1 else "LF"
+    content = normalize_to_lf(raw.decode("utf-8", errors="replace"))
 
     # Apply the edit with advanced matching if needed
-    _, updated_file, error = await apply_edit(full_file_path, old_string, new_string)
+    _, updated_file, error = apply_edit_pure(
+        content, old_string, new_string, build_patch=False
+    )
 
     # If there was an error during apply_edit, raise it
     if error:
@@ -940,16 +980,14 @@ async def edit_file(
             "No changes were made despite passing all checks. This is unexpected.",
         )
 
-    # Create directory if it doesn't exist
-    directory = os.path.dirname(full_file_path)
-    os.makedirs(directory, exist_ok=True)
-
     # Write the modified content back to the file
-    await write_text_content(full_file_path, updated_file, "utf-8", line_endings)
+    mtime = await write_text_content(
+        full_file_path, updated_file, "utf-8", line_endings
+    )
 
     # Update read timestamp
     if read_file_timestamps is not None:
-        read_file_timestamps[full_file_path] = os.stat(full_file_path).st_mtime
+        read_file_timestamps[full_file_path] = mtime
 
     # Try to run the formatter on the file
     format_message = ""
@@ -957,14 +995,14 @@ async def edit_file(
         full_file_path
     )
     if formatter_success:
-        logger.info(f"Auto-formatted {full_file_path}")
+        logger.info("Auto-formatted %s", full_file_path)
         if formatter_output.strip():
             format_message = "\nAuto-formatted the file"
     else:
         # Only log warning if there was actually a format command configured but it failed
         if not "No format command configured" in formatter_output:
             logger.warning(
-                f"Failed to auto-format {full_file_path}: {formatter_output}"
+                "Failed to auto-format %s: %s", full_file_path, formatter_output
             )
 
     # Generate a snippet of the edited file to show in the response
@@ -74,5 +74,7 @@ async def run_command(
     )
 
     # Append commit hash
-    result, _ = await append_commit_hash(result, effective_project_dir, commit_hash)
+    result, _ = await append_commit_hash(
+        result, effective_project_dir, commit_hash, already_normalized=True
+    )
     return result
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Tests for code_command.check_for_changes."""
+
+import os
+import unittest
+
+from codemcp import code_command
+from codemcp.code_command import check_for_changes, clear_repo_caches
+from codemcp.testing import MCPEndToEndTestCase
+
+
+class CheckForChangesTest(MCPEndToEndTestCase):
+    """Test detecting uncommitted changes in the repository."""
+
+    def write(self, name: str, content: str) -> None:
+        path = os.path.join(self.temp_dir.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    async def test_clean_repository(self):
+        """Test that a clean repository has no changes."""
+        self.assertFalse(await check_for_changes(self.temp_dir.name))
+
+    async def test_modified_file(self):
+        """Test that unstaged and staged modifications are detected."""
+        self.write("README.md", "# Changed\n")
+        self.assertTrue(await check_for_changes(self.temp_dir.name))
+
+        await self.git_run(["add", "README.md"])
+        self.assertTrue(await check_for_changes(self.temp_dir.name))
+
+    async def test_untracked_and_ignored_files(self):
+        """Test that untracked files count as changes but ignored ones don't."""
+        self.write(".gitignore", "ignored/\n")
+        await self.git_run(["add", ".gitignore"])
+        await self.git_run(["commit", "-m", "Add .gitignore"])
+
+        self.write("ignored/file.txt", "ignored\n")
+        self.assertFalse(await check_for_changes(self.temp_dir.name))
+
+        self.write("sub/new.txt", "new\n")
+        self.assertTrue(await check_for_changes(self.temp_dir.name))
+
+    async def test_repository_without_commits(self):
+        """Test a repository whose HEAD doesn't exist yet."""
+        await self.git_run(["update-ref", "-d", "HEAD"])
+        self.assertTrue(await check_for_changes(self.temp_dir.name))
+
+    async def test_repository_root_is_cached(self):
+        """Test that the repository root lookup is cached and can be cleared."""
+        subdir = os.path.join(self.temp_dir.name, "sub")
+        os.makedirs(subdir)
+        self.assertFalse(await check_for_changes(subdir))
+        cached_root = code_command._repo_root_cache.get(subdir)
+        self.assertIsNotNone(cached_root)
+        self.assertEqual(
+            os.path.realpath(cached_root or ""), os.path.realpath(self.temp_dir.name)
+        )
+
+        clear_repo_caches()
+        self.assertNotIn(subdir, code_command._repo_root_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+"""Tests for append_commit_hash."""
+
+import unittest
+from unittest import mock
+
+from codemcp.testing import MCPEndToEndTestCase
+from codemcp.tools import commit_utils
+from codemcp.tools.commit_utils import append_commit_hash
+
+
+class AppendCommitHashTest(MCPEndToEndTestCase):
+    """Test reporting the current commit hash."""
+
+    async def current_short_hash(self) -> str:
+        return await self.git_run(
+            ["rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        )
+
+    async def test_hash_is_reused_until_head_moves(self):
+        """Test that the hash is cached and refreshed after a new commit."""
+        with mock.patch.object(
+            commit_utils,
+            "get_current_commit_hash",
+            wraps=commit_utils.get_current_commit_hash,
+        ) as get_hash:
+            _, first = await append_commit_hash("result", self.temp_dir.name)
+            self.assertEqual(first, await self.current_short_hash())
+
+            _, again = await append_commit_hash("result", self.temp_dir.name)
+            self.assertEqual(again, first)
+            self.assertEqual(get_hash.call_count, 1)
+
+            await self.git_run(["commit", "--allow-empty", "-m", "Move HEAD"])
+            _, moved = await append_commit_hash("result", self.temp_dir.name)
+            self.assertEqual(moved, await self.current_short_hash())
+            self.assertNotEqual(moved, first)
+
+            await self.git_run(["checkout", "-q", "--detach", "HEAD~1"])
+            _, detached = await append_commit_hash("result", self.temp_dir.name)
+            self.assertEqual(detached, first)
+            self.assertEqual(get_hash.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
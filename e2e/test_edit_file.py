@@ -81,6 +81,35 @@ On branch main
 nothing to commit, working tree clean""",
             )
 
+    async def test_edit_file_preserves_crlf(self):
+        """Test that editing a CRLF file keeps its line endings."""
+        test_file_path = os.path.join(self.temp_dir.name, "crlf.txt")
+        with open(test_file_path, "wb") as f:
+            f.write(b"Line 1\r\nLine 2\r\nLine 3\r\n")
+
+        await self.git_run(["add", "crlf.txt"])
+        await self.git_run(["commit", "-m", "Add CRLF file"])
+
+        async with self.create_client_session() as session:
+            chat_id = await self.get_chat_id(session)
+
+            result_text = await self.call_tool_assert_success(
+                session,
+                "codemcp",
+                {
+                    "subtool": "EditFile",
+                    "path": test_file_path,
+                    "old_string": "Line 2\n",
+                    "new_string": "Modified Line 2\n",
+                    "description": "Modify line 2",
+                    "chat_id": chat_id,
+                },
+            )
+            self.assertIn("Successfully edited", result_text)
+
+            with open(test_file_path, "rb") as f:
+                self.assertEqual(f.read(), b"Line 1\r\nModified Line 2\r\nLine 3\r\n")
+
     async def test_edit_untracked_file(self):
         """Test that codemcp properly handles editing files that aren't tracked by git."""
         # Create a file but don't commit it to git
@@ -3,9 +3,13 @@
 """Tests for the git_run helper method."""
 
 import os
+import shutil
 import subprocess
 import unittest
+from unittest import mock
 
+from codemcp import git_query, shell
+from codemcp.git_query import is_git_repository
 from codemcp.testing import MCPEndToEndTestCase
 
 
@@ -81,6 +85,64 @@ class GitHelperTest(MCPEndToEndTestCase):
         # Should have 4 commits (3 new ones + initial repo setup)
         self.assertEqual(commit_count, 4, "Should have 4 commits in total")
 
+    async def test_fast_queries_match_git(self):
+        """Test that queries answered by git_cat match what git prints."""
+        await self.git_run(["commit", "--allow-empty", "-m", "Subject\n\nBody"])
+
+        for args in (
+            ["log", "-1", "--pretty=%B"],
+            ["log", "-1", "--pretty=%B", "HEAD~1"],
+            ["rev-parse", "HEAD"],
+            ["rev-parse", "HEAD:README.md"],
+        ):
+            # Passing cwd explicitly forces git_run to spawn git
+            expected = await self.git_run(
+                args, capture_output=True, text=True, cwd=self.temp_dir.name
+            )
+            actual = await self.git_run(args, capture_output=True, text=True)
+            self.assertEqual(actual, expected, args)
+
+        readme = await self.git_cat("HEAD:README.md")
+        self.assertEqual(readme, b"# Test Repository\n")
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            await self.git_cat("HEAD:no-such-file")
+        with self.assertRaises(subprocess.CalledProcessError):
+            await self.git_run(["rev-parse", "no-such-ref"], capture_output=True)
+
+    async def test_is_git_repository_cache(self):
+        """Test that confirmed repositories are remembered until .git goes away."""
+        subdir = os.path.join(self.temp_dir.name, "sub", "missing")
+        self.assertTrue(await is_git_repository(subdir))
+
+        with mock.patch.object(git_query, "get_repository_root") as get_root:
+            self.assertTrue(await is_git_repository(subdir))
+            get_root.assert_not_called()
+
+        # Without its .git directory the path has to be checked with git again
+        shutil.rmtree(os.path.join(self.temp_dir.name, ".git"))
+        with mock.patch.object(
+            git_query, "get_repository_root", side_effect=ValueError
+        ) as get_root:
+            self.assertFalse(await is_git_repository(subdir))
+            get_root.assert_called_once()
+
+    async def test_is_git_repository_inherited_env(self):
+        """Test the cache when subprocesses inherit the server's environment."""
+        subdir = os.path.join(self.temp_dir.name, "sub")
+        # get_subprocess_env() returns None outside the test harness
+        with mock.patch.object(shell, "get_subprocess_env", return_value=None):
+            self.assertTrue(await is_git_repository(subdir))
+
+            with mock.patch.object(git_query, "get_repository_root") as get_root:
+                self.assertTrue(await is_git_repository(subdir))
+                get_root.assert_not_called()
+
+                # An inherited GIT_DIR bypasses the cache
+                with mock.patch.dict(os.environ, {"GIT_DIR": "/nonexistent"}):
+                    self.assertTrue(await is_git_repository(subdir))
+                get_root.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
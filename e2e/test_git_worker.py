@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""Tests for the persistent git cat-file worker."""
+
+import os
+import unittest
+
+from codemcp import git_worker
+from codemcp.git_query import get_head_commit_message, get_ref_commit_message
+from codemcp.git_worker import query, read_commit
+from codemcp.testing import MCPEndToEndTestCase
+
+
+class GitWorkerTest(MCPEndToEndTestCase):
+    """Test reading git objects through git_worker."""
+
+    async def test_read_commit_matches_git(self):
+        """Test that read_commit returns the same tree and message as git."""
+        await self.git_run(["commit", "--allow-empty", "-m", "Subject\n\nBody text"])
+
+        commit = await read_commit(self.temp_dir.name, "HEAD")
+        self.assertIsNotNone(commit)
+        assert commit is not None
+
+        tree_hash = await self.git_run(
+            ["show", "-s", "--format=%T", "HEAD"], capture_output=True, text=True
+        )
+        self.assertEqual(commit[0], tree_hash)
+        self.assertEqual(commit[1].strip(), "Subject\n\nBody text")
+        self.assertEqual(
+            await get_head_commit_message(self.temp_dir.name), "Subject\n\nBody text"
+        )
+
+    async def test_worker_sees_new_commits(self):
+        """Test that a reused worker picks up commits made after it started."""
+        await read_commit(self.temp_dir.name, "HEAD")
+
+        test_file_path = os.path.join(self.temp_dir.name, "new.txt")
+        with open(test_file_path, "w") as f:
+            f.write("New content")
+        await self.git_run(["add", "new.txt"])
+        await self.git_run(["commit", "-m", "Add new file"])
+
+        commit = await read_commit(self.temp_dir.name, "HEAD")
+        assert commit is not None
+        self.assertEqual(commit[1].strip(), "Add new file")
+
+    async def test_missing_objects(self):
+        """Test that missing objects and refs are reported as None."""
+        self.assertIsNone(await query(self.temp_dir.name, "no-such-ref"))
+        self.assertIsNone(await read_commit(self.temp_dir.name, "HEAD:README.md"))
+        self.assertIsNone(
+            await get_ref_commit_message(self.temp_dir.name, "refs/codemcp/missing")
+        )
+
+        await self.git_run(["update-ref", "refs/codemcp/present", "HEAD"])
+        message = await get_ref_commit_message(
+            self.temp_dir.name, "refs/codemcp/present"
+        )
+        self.assertEqual(message, await get_head_commit_message(self.temp_dir.name))
+
+    async def test_invalid_object_name(self):
+        """Test that object names containing newlines are rejected."""
+        with self.assertRaises(ValueError):
+            await query(self.temp_dir.name, "HEAD\nHEAD")
+
+    async def test_kill_workers(self):
+        """Test that kill_workers stops running workers without awaiting them."""
+        await read_commit(self.temp_dir.name, "HEAD")
+        workers = list(git_worker._workers.values())
+        self.assertTrue(workers)
+
+        git_worker.kill_workers()
+        self.assertEqual(git_worker._workers, {})
+        for worker in workers:
+            assert worker.process is not None
+            await worker.process.wait()
+            self.assertFalse(worker.alive)
+
+        # A later query starts a fresh worker
+        self.assertIsNotNone(await read_commit(self.temp_dir.name, "HEAD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
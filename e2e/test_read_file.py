@@ -34,6 +34,36 @@ class ReadFileTest(MCPEndToEndTestCase):
             for line in test_content.splitlines():
                 self.assertIn(line, result_text)
 
+    async def test_read_files_concurrently(self):
+        """Test reading several files with call_tools_concurrent."""
+        contents = [f"Content of file {i}\n" for i in range(4)]
+        for i, content in enumerate(contents):
+            with open(os.path.join(self.temp_dir.name, f"file{i}.txt"), "w") as f:
+                f.write(content)
+
+        async with self.create_client_session() as session:
+            chat_id = await self.get_chat_id(session)
+
+            results = await self.call_tools_concurrent(
+                session,
+                [
+                    (
+                        "codemcp",
+                        {
+                            "subtool": "ReadFile",
+                            "path": os.path.join(self.temp_dir.name, f"file{i}.txt"),
+                            "chat_id": chat_id,
+                        },
+                    )
+                    for i in range(len(contents))
+                ],
+                max_concurrency=2,
+            )
+
+            self.assertEqual(len(results), len(contents))
+            for result_text, content in zip(results, contents):
+                self.assertIn(content.strip(), result_text)
+
     async def test_read_file_with_offset_limit(self):
         """Test the ReadFile subtool with offset and limit."""
         # Create a test file with multiple lines
@@ -173,6 +173,7 @@ class TrailingWhitespaceTest(MCPEndToEndTestCase):
 
 class OutOfProcessTrailingWhitespaceTest(TrailingWhitespaceTest):
     in_process = False
+    use_stdio = True
 
 
 if __name__ == "__main__":
@@ -649,6 +649,7 @@ codemcp-id: test-chat-id""",
 
 class OutOfProcessWriteFileTest(WriteFileTest):
     in_process = False
+    use_stdio = True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""Unit tests for async_file_utils.py module."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from codemcp.async_file_utils import async_detect_encoding, async_detect_line_endings
+
+
+class DetectTest(unittest.IsolatedAsyncioTestCase):
+    """Test encoding and line ending detection."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.file_path = os.path.join(self.temp_dir.name, "file.txt")
+
+    def write(self, content: bytes, mtime_ns: int) -> None:
+        with open(self.file_path, "wb") as f:
+            f.write(content)
+        os.utime(self.file_path, ns=(mtime_ns, mtime_ns))
+
+    async def test_missing_file(self):
+        """Test that a missing file is reported as utf-8."""
+        self.assertEqual(await async_detect_encoding(self.file_path), "utf-8")
+
+    async def test_line_endings_follow_file_changes(self):
+        """Test that cached results are invalidated when the file changes."""
+        self.write(b"a\r\nb\r\n", 1_000_000_000)
+        self.assertEqual(await async_detect_line_endings(self.file_path), "CRLF")
+        self.assertEqual(await async_detect_line_endings(self.file_path), "CRLF")
+
+        # Same size, new mtime
+        self.write(b"a\nbb\nc", 2_000_000_000)
+        self.assertEqual(await async_detect_line_endings(self.file_path), "LF")
+
+    async def test_encoding_follows_file_changes(self):
+        """Test that cached encodings are invalidated when the file changes."""
+        self.write("héllo\n".encode("utf-8"), 1_000_000_000)
+        self.assertEqual(await async_detect_encoding(self.file_path), "utf-8")
+        self.assertEqual(await async_detect_encoding(self.file_path), "utf-8")
+
+        self.write("héllo\n".encode("latin-1"), 2_000_000_000)
+        self.assertEqual(await async_detect_encoding(self.file_path), "latin-1")
+
+    async def test_encoding_sample_boundary(self):
+        """Test that a character split by the sample boundary is still utf-8."""
+        with mock.patch("codemcp.async_file_utils._ENCODING_SAMPLE_SIZE", 4):
+            self.write("abcé".encode("utf-8"), 1_000_000_000)
+            self.assertEqual(await async_detect_encoding(self.file_path), "utf-8")
+
+    async def test_encoding_truncated_at_eof(self):
+        """Test that a file ending in an incomplete character is not utf-8."""
+        self.write(b"abc" + "é".encode("utf-8")[:1], 1_000_000_000)
+        self.assertEqual(await async_detect_encoding(self.file_path), "latin-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
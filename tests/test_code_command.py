@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""Unit tests for code_command.py module."""
+
+import os
+import tempfile
+import unittest
+
+from codemcp.code_command import get_command_from_config
+
+
+class GetCommandFromConfigTest(unittest.TestCase):
+    """Test reading commands from codemcp.toml."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.config_path = os.path.join(self.temp_dir.name, "codemcp.toml")
+
+    def write_config(self, content: str, mtime_ns: int) -> None:
+        with open(self.config_path, "w") as f:
+            f.write(content)
+        os.utime(self.config_path, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_config(self):
+        """Test that a missing codemcp.toml yields no command."""
+        self.assertIsNone(get_command_from_config(self.temp_dir.name, "lint"))
+
+    def test_config_changes_are_picked_up(self):
+        """Test that an edited codemcp.toml is parsed again."""
+        self.write_config('[commands]\nlint = ["ruff", "check"]\n', 1_000_000_000)
+        self.assertEqual(
+            get_command_from_config(self.temp_dir.name, "lint"), ["ruff", "check"]
+        )
+
+        # Callers may extend the returned list without affecting later calls
+        get_command_from_config(self.temp_dir.name, "lint").append("--fix")  # type: ignore
+        self.assertEqual(
+            get_command_from_config(self.temp_dir.name, "lint"), ["ruff", "check"]
+        )
+
+        self.write_config(
+            '[commands]\nlint = { command = ["ruff", "format"] }\n', 2_000_000_000
+        )
+        self.assertEqual(
+            get_command_from_config(self.temp_dir.name, "lint"), ["ruff", "format"]
+        )
+        self.assertIsNone(get_command_from_config(self.temp_dir.name, "test"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 
+import logging
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 from expecttest import TestCase
 
+from codemcp.tools import edit_file
 from codemcp.tools.edit_file import (
     apply_edit_pure,
+    debug_string_comparison,
+    find_similar_file,
+    find_similar_lines,
+    perfect_replace,
+    replace_closest_edit_distance,
 )
 
 
@@ -59,6 +69,17 @@ class TestEditFileStringMatching(TestCase):
 """,
         )
 
+    def test_trailing_whitespace_in_old_string_only(self):
+        # Test stripped matching when only old_string has trailing whitespace
+        content = "line1\nline2\nline3\n"
+        old_string = "line2  \nline3"
+        new_string = "replaced2\nreplaced3"
+
+        _, updated_content, error = apply_edit_pure(content, old_string, new_string)
+
+        self.assertIsNone(error)
+        self.assertExpectedInline(updated_content, """line1\nreplaced2\nreplaced3\n""")
+
     def test_whitespace_match(self):
         # Test whitespace-flexible matching (previously in TestMatchButForLeadingWhitespace)
         content = "    line1\n    line2\n    line3\n"
@@ -197,6 +218,23 @@ class TestEditFileStringMatching(TestCase):
 +New Line 2""",
         )
 
+    def test_without_patch(self):
+        # Test that build_patch=False yields the same content and no patch
+        content = "Line 1\nLine 2  \nLine 3\n"
+        for old_string, new_string in [
+            ("Line 2  ", "New Line 2"),
+            ("Line 2\nLine 3", "New Line 2\nLine 3"),
+            ("", "New file\n"),
+        ]:
+            patch, updated_content, error = apply_edit_pure(
+                content, old_string, new_string, build_patch=False
+            )
+            self.assertIsNone(error)
+            self.assertEqual(patch, [])
+            self.assertEqual(
+                updated_content, apply_edit_pure(content, old_string, new_string)[1]
+            )
+
     def test_multiple_matches(self):
         # Test handling of multiple matches
         content = "line1\nline2\nline1\nline2\n"
@@ -211,5 +249,99 @@ class TestEditFileStringMatching(TestCase):
         self.assertEqual(len(_), 0)
 
 
+class TestDebugStringComparison(TestCase):
+    def test_skips_diagnostics_without_debug_logging(self):
+        with mock.patch.object(edit_file.logger, "isEnabledFor", return_value=False):
+            with mock.patch.object(edit_file.difflib, "unified_diff") as diff:
+                self.assertTrue(debug_string_comparison("a\n", "b\n"))
+                self.assertFalse(debug_string_comparison("a\n", "a\n"))
+                diff.assert_not_called()
+
+    def test_logs_differences_with_debug_logging(self):
+        with self.assertLogs(edit_file.logger, logging.DEBUG) as logs:
+            self.assertTrue(debug_string_comparison("a\n  \nb", "a\n\nb"))
+        output = "\n".join(logs.output)
+        self.assertIn("Line differences (first 5):", output)
+        self.assertIn("    -  \n", output)
+        self.assertIn(
+            "Strings match when normalizing only whitespace-only lines!", output
+        )
+
+
+class TestSimilarityMatching(TestCase):
+    def test_replace_closest_edit_distance(self):
+        whole_lines = ["def f():\n", "    return 1\n", "\n", "def g():\n", "    pass\n"]
+        replace_lines = ["def g():\n", "    return 2\n"]
+
+        # An identical chunk is replaced
+        part_lines = ["def g():\n", "    pass\n"]
+        self.assertEqual(
+            replace_closest_edit_distance(
+                whole_lines, "".join(part_lines), part_lines, replace_lines
+            ),
+            "def f():\n    return 1\n\ndef g():\n    return 2\n",
+        )
+
+        # A close enough chunk is replaced
+        part_lines = ["def g():\n", "    pas\n"]
+        self.assertEqual(
+            replace_closest_edit_distance(
+                whole_lines, "".join(part_lines), part_lines, replace_lines
+            ),
+            "def f():\n    return 1\n\ndef g():\n    return 2\n",
+        )
+
+        # Nothing is similar enough
+        part_lines = ["class C:\n", "    x = 1\n"]
+        self.assertIsNone(
+            replace_closest_edit_distance(
+                whole_lines, "".join(part_lines), part_lines, replace_lines
+            )
+        )
+
+    def test_perfect_replace(self):
+        whole_lines = ["a\n", "b  \n", "c\n", "b\n", "d\n"]
+        self.assertEqual(
+            perfect_replace(whole_lines, ["b\n", "d\n"], ["X\n"]), "a\nb  \nc\nX\n"
+        )
+        # Trailing whitespace is ignored when matching
+        self.assertEqual(
+            perfect_replace(whole_lines, ["b\n", "c \n"], ["X\n"]), "a\nX\nb\nd\n"
+        )
+        self.assertIsNone(perfect_replace(whole_lines, ["c\n", "d\n"], ["X\n"]))
+
+    def test_find_similar_lines(self):
+        content = "a = 1\nb = 2\nc = 3\nd = 4\n"
+        self.assertEqual(find_similar_lines("b = 2\nc = 3", content), "b = 2\nc = 3")
+        self.assertEqual(
+            find_similar_lines("b = 2\nc = 3\nd = 5", content),
+            "a = 1\nb = 2\nc = 3\nd = 4",
+        )
+        self.assertEqual(find_similar_lines("xyz\nuvw", content), "")
+
+
+class TestFindSimilarFile(TestCase):
+    def test_find_similar_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ("module.py", "module_test.py", "module.pyi"):
+                open(os.path.join(temp_dir, name), "w").close()
+
+            self.assertIn(
+                find_similar_file(os.path.join(temp_dir, "module.txt")),
+                (
+                    os.path.join(temp_dir, "module.py"),
+                    os.path.join(temp_dir, "module.pyi"),
+                ),
+            )
+            self.assertEqual(
+                find_similar_file(os.path.join(temp_dir, "module.py")),
+                os.path.join(temp_dir, "module.pyi"),
+            )
+            self.assertIsNone(find_similar_file(os.path.join(temp_dir, "other.py")))
+            self.assertIsNone(
+                find_similar_file(os.path.join(temp_dir, "missing", "module.py"))
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
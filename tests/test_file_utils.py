@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+"""Unit tests for file_utils.py module."""
+
+import os
+import stat
+import tempfile
+import unittest
+
+from codemcp.file_utils import write_text_content
+
+
+class WriteTextContentTest(unittest.IsolatedAsyncioTestCase):
+    """Test writing text files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.file_path = os.path.join(self.temp_dir.name, "file.txt")
+
+    async def test_new_file(self):
+        """Test creating a file in a missing directory."""
+        path = os.path.join(self.temp_dir.name, "sub", "new.txt")
+        mtime = await write_text_content(path, "a  \r\nb", line_endings="LF")
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"a\nb\n")
+        self.assertEqual(mtime, os.stat(path).st_mtime)
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["new.txt"])
+
+    async def test_replace_keeps_mode_and_symlinks(self):
+        """Test that overwriting keeps permissions and writes through symlinks."""
+        with open(self.file_path, "w") as f:
+            f.write("old\n")
+        os.chmod(self.file_path, 0o750)
+        link_path = os.path.join(self.temp_dir.name, "link.txt")
+        os.symlink("file.txt", link_path)
+
+        await write_text_content(link_path, "new\n", line_endings="CRLF")
+
+        self.assertTrue(os.path.islink(link_path))
+        with open(self.file_path, "rb") as f:
+            self.assertEqual(f.read(), b"new\r\n")
+        self.assertEqual(stat.S_IMODE(os.stat(self.file_path).st_mode), 0o750)
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)), ["file.txt", "link.txt"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""Unit tests for shell.py module."""
+
+import asyncio
+import os
+import subprocess
+import time
+import unittest
+from unittest import mock
+
+from codemcp.shell import get_max_subprocesses, run_command
+
+
+class RunCommandTest(unittest.IsolatedAsyncioTestCase):
+    """Test the async run_command helper."""
+
+    async def test_capture_output(self):
+        """Test capturing stdout and stderr as text."""
+        result = await run_command(["sh", "-c", "echo out; echo err >&2"])
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "out\n")
+        self.assertEqual(result.stderr, "err\n")
+
+    async def test_input(self):
+        """Test passing input to the process's stdin."""
+        result = await run_command(["cat"], input="hello")
+        self.assertEqual(result.stdout, "hello")
+
+    async def test_discard_stdout(self):
+        """Test that stdout can be discarded while stderr is still captured."""
+        result = await run_command(
+            ["sh", "-c", "echo out; echo err >&2"], discard_stdout=True
+        )
+        self.assertEqual(result.stdout, "")
+        self.assertEqual(result.stderr, "err\n")
+
+    async def test_check_failure(self):
+        """Test that a non-zero exit code raises RuntimeError when check=True."""
+        with self.assertRaises(RuntimeError):
+            await run_command(["false"])
+
+        result = await run_command(["false"], check=False)
+        self.assertEqual(result.returncode, 1)
+
+    async def test_timeout_keeps_partial_output(self):
+        """Test that output produced before a timeout is attached to the error."""
+        with self.assertRaises(subprocess.TimeoutExpired) as cm:
+            await run_command(
+                ["sh", "-c", "echo out; echo err >&2; exec sleep 5"], wait_time=0.5
+            )
+        self.assertEqual(cm.exception.stdout, b"out\n")
+        self.assertEqual(cm.exception.stderr, b"err\n")
+
+    async def test_timeout_without_capture(self):
+        """Test that no output is attached when output isn't captured."""
+        with self.assertRaises(subprocess.TimeoutExpired) as cm:
+            await run_command(["sleep", "5"], capture_output=False, wait_time=0.1)
+        self.assertIsNone(cm.exception.stdout)
+        self.assertIsNone(cm.exception.stderr)
+
+    async def test_concurrency_limit(self):
+        """Test that CODEMCP_MAX_SUBPROCESSES bounds concurrent processes."""
+        with mock.patch.dict(os.environ, {"CODEMCP_MAX_SUBPROCESSES": "1"}):
+            start = time.monotonic()
+            await asyncio.gather(*(run_command(["sleep", "0.2"]) for _ in range(3)))
+            self.assertGreaterEqual(time.monotonic() - start, 0.6)
+
+
+class MaxSubprocessesTest(unittest.TestCase):
+    """Test parsing of CODEMCP_MAX_SUBPROCESSES."""
+
+    def test_max_subprocesses(self):
+        """Test valid, empty and invalid values."""
+        with mock.patch.dict(os.environ, {"CODEMCP_MAX_SUBPROCESSES": "3"}):
+            self.assertEqual(get_max_subprocesses(), 3)
+
+        with mock.patch.dict(os.environ, {"CODEMCP_MAX_SUBPROCESSES": ""}):
+            default = get_max_subprocesses()
+            self.assertGreaterEqual(default, 4)
+
+        for invalid in ("0", "-2", "many"):
+            with mock.patch.dict(os.environ, {"CODEMCP_MAX_SUBPROCESSES": invalid}):
+                self.assertEqual(get_max_subprocesses(), default)
+
+
+if __name__ == "__main__":
+    unittest.main()
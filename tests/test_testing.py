@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+"""Unit tests for helpers in testing.py."""
+
+import re
+import unittest
+
+from codemcp.testing import MCPEndToEndTestCase, _find_chat_id
+
+
+def _unwrap():
+    # _unwrap_exception_groups doesn't use self, so there's no need to set up
+    # a whole end-to-end test case (and its repository) to exercise it
+    return MCPEndToEndTestCase._unwrap_exception_groups(None)  # type: ignore
+
+
+class UnwrapExceptionGroupsTest(unittest.IsolatedAsyncioTestCase):
+    """Test MCPEndToEndTestCase._unwrap_exception_groups."""
+
+    async def test_single_exception_is_unwrapped(self):
+        with self.assertRaises(ValueError):
+            async with _unwrap():
+                raise ExceptionGroup("outer", [ExceptionGroup("inner", [ValueError()])])
+
+    async def test_plain_exception_passes_through(self):
+        with self.assertRaises(KeyError):
+            async with _unwrap():
+                raise KeyError("x")
+
+    async def test_multiple_exceptions_are_kept(self):
+        with self.assertRaises(ExceptionGroup) as cm:
+            async with _unwrap():
+                raise ExceptionGroup("outer", [ValueError(), KeyError()])
+        self.assertEqual(len(cm.exception.exceptions), 2)
+
+    async def test_nested_group_is_unwrapped_to_first_split(self):
+        with self.assertRaises(ExceptionGroup) as cm:
+            async with _unwrap():
+                raise ExceptionGroup(
+                    "outer", [ExceptionGroup("inner", [ValueError(), KeyError()])]
+                )
+        self.assertEqual(cm.exception.message, "inner")
+
+
+class FindChatIdTest(unittest.TestCase):
+    """Test _find_chat_id against the regex it replaces."""
+
+    def test_matches_regex(self):
+        pattern = re.compile(r"chat ID: ([a-zA-Z0-9-]+)")
+        for text in [
+            "Project initialized. chat ID: 12-test-chat\nmore",
+            "chat ID: abc",
+            "chat ID: \nchat ID: second-one.",
+            "chat ID: ü then chat ID: x9",
+            "chat ID:abc",
+            "no id here",
+            "",
+        ]:
+            match = pattern.search(text)
+            expected = match.group(1) if match else None
+            self.assertEqual(_find_chat_id(text), expected, text)
+
+
+if __name__ == "__main__":
+    unittest.main()